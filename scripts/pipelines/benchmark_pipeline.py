@@ -0,0 +1,324 @@
+# football_data_warehouse/scripts/pipelines/benchmark_pipeline.py
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+# Only pandas-free modules at import time, so --help (also through
+# pipeline.py bench) returns quickly; numpy, pandas and the engine are
+# imported where data is generated or processed.
+import combined_leagues
+from process.formats import OUTPUT_FORMATS, output_path as table_path
+from process.instrument import Instrumentation, stage
+from process.schema import HEADER_ROWS, get_schema, read_header_text
+from process.specs import (
+    STAT_CATEGORIES,
+    get_data_dir,
+    league_jobs,
+    raw_data_dir_for,
+    raw_file_paths,
+)
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Engine stages reported, in execution order (see process.instrument.stage);
+# write covers the league tables and the combined dataset
+STAGES = ("read", "per_90", "pair_merge", "league_merge", "combine", "write")
+
+# Real league whose raw files provide the headers and value ranges
+TEMPLATE_LEAGUE = "Premier_League"
+
+# Stage slow-downs below this many seconds are treated as timer noise
+NOISE_FLOOR_SECONDS = 0.005
+
+# Stage memory growth below this many MiB is treated as allocator noise
+NOISE_FLOOR_MB = 1.0
+
+# First season of multi-season synthetic data (2000-2001, 2001-2002, ...)
+FIRST_SEASON_YEAR = 2000
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MiB (None if unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and KiB elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def synthetic_values(template_col, n_rows, rng):
+    """Random values spanning the range (and blank rate) of a template column"""
+    import numpy as np
+    import pandas as pd
+
+    values = template_col.dropna()
+    if values.empty:
+        return np.full(n_rows, np.nan)
+
+    low, high = values.min(), values.max()
+    if pd.api.types.is_integer_dtype(values):
+        generated = rng.integers(low, high + 1, n_rows).astype(np.float64)
+    else:
+        generated = rng.uniform(low, high, n_rows).round(2)
+
+    blank_rate = template_col.isna().mean()
+    if blank_rate:
+        generated[rng.random(n_rows) < blank_rate] = np.nan
+    return generated
+
+
+def synthetic_seasons(n_seasons):
+    """Season folder names of multi-season synthetic data; a single season is the unpartitioned snapshot"""
+    if n_seasons <= 1:
+        return [None]
+    return [f"{FIRST_SEASON_YEAR + i}-{FIRST_SEASON_YEAR + i + 1}" for i in range(n_seasons)]
+
+
+def benchmark_layout(n_seasons):
+    """Processed layout that holds ``n_seasons`` seasons per league"""
+    return "partitioned" if n_seasons > 1 else "flat"
+
+
+def write_synthetic_season(raw_data_dir, teams, template_paths, rng, categories=STAT_CATEGORIES):
+    """Write one season's raw files for ``teams`` into ``raw_data_dir``"""
+    import pandas as pd
+
+    os.makedirs(raw_data_dir, exist_ok=True)
+
+    for key, template_path in template_paths.items():
+        schema = get_schema(template_path)
+        template = pd.read_csv(
+            template_path, skiprows=HEADER_ROWS, header=None, names=list(schema.legacy)
+        )
+        prefix = "vs " if key[1] else ""
+        frame = pd.DataFrame({
+            name: [prefix + team for team in teams] if name == "Squad"
+            else synthetic_values(template[name], len(teams), rng)
+            for name in schema.legacy
+        })
+        # Whole numbers are written without a trailing .0, like FBref does
+        frame = frame.apply(
+            lambda col: col.astype("Int64")
+            if col.dtype.kind == "f" and col.dropna().mod(1).eq(0).all() else col
+        )
+
+        with open(raw_file_paths(raw_data_dir, categories)[key], "w", encoding="utf-8", newline="") as f:
+            f.write(read_header_text(template_path))
+            frame.to_csv(f, header=False, index=False)
+
+
+def synthesize_raw_data(data_dir, n_leagues=10, n_seasons=1, n_teams=20, seed=0,
+                        template_dir=None, categories=STAT_CATEGORIES):
+    """Write FBref-shaped raw files for synthetic leagues under ``data_dir``
+
+    Each league gets the squad and opponent file of every category, with
+    the template's two-row header and ``n_teams`` team rows. With several
+    seasons each one gets its own season folder (``<League>_data/<season>/``),
+    as the partitioned layout expects. Returns the synthetic league names.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    template_dir = template_dir or raw_data_dir_for(TEMPLATE_LEAGUE, get_data_dir())
+    template_paths = raw_file_paths(template_dir, categories)
+
+    leagues = [f"Synthetic_{i:02d}" for i in range(1, n_leagues + 1)]
+    teams = [f"Team {team:03d}" for team in range(1, n_teams + 1)]
+    for league in leagues:
+        for season in synthetic_seasons(n_seasons):
+            write_synthetic_season(
+                raw_data_dir_for(league, data_dir, season), [f"{league} {team}" for team in teams],
+                template_paths, rng, categories,
+            )
+    return leagues
+
+
+def run_once(data_dir, leagues, output_format="csv", column_names="legacy", categories=STAT_CATEGORIES,
+             layout="flat", trace_memory=False):
+    """Run the pipeline engine over ``leagues`` and return the per-stage totals of its records
+
+    Every (league, season) job goes through league_engine.run_league, as in
+    process_pipelines, then the tables are combined and written, all under
+    one Instrumentation recorder. With ``trace_memory`` the totals hold
+    each stage's own tracemalloc peak (timings of a traced run are not
+    representative).
+    """
+    from process.league_engine import run_league
+    from process.outputs import write_table
+
+    recorder = Instrumentation(trace_memory)
+    league_frames = {}
+    # The engine reports every league it saves, which would drown the benchmark table
+    with recorder.activate(), contextlib.redirect_stdout(io.StringIO()):
+        for league, season in league_jobs(leagues, layout, data_dir):
+            key = league if layout == "flat" else (league, season)
+            league_frames[key] = run_league(
+                league, data_dir, output_format, column_names=column_names, season=season, layout=layout,
+                categories=categories,
+            )
+
+        with stage("combine", league_frames) as combine:
+            combined_df = combine.output(combined_leagues.combine_frames(league_frames))
+
+        final_dir = os.path.join(data_dir, "Final_data")
+        os.makedirs(final_dir, exist_ok=True)
+        with stage("write", combined_df, format=output_format):
+            write_table(combined_df, table_path(final_dir, "Combined_Leagues_Stats", output_format), output_format)
+    return recorder.summary()
+
+
+def raw_input_stats(data_dir, leagues, categories=STAT_CATEGORIES, layout="flat"):
+    """Total files, bytes and data rows across every raw file of ``leagues``"""
+    total_files = total_bytes = total_rows = 0
+    for league, season in league_jobs(leagues, layout, data_dir):
+        for path in raw_file_paths(raw_data_dir_for(league, data_dir, season), categories).values():
+            total_files += 1
+            total_bytes += os.path.getsize(path)
+            with open(path, "rb") as f:
+                total_rows += sum(1 for _ in f) - HEADER_ROWS
+    return total_files, total_bytes, total_rows
+
+
+def run_benchmark(data_dir, leagues, repeat=3, output_format="csv", column_names="legacy", layout="flat"):
+    """Time each stage ``repeat`` times and build a report with the best run
+
+    One more run traces memory to give each stage's own peak (see run_once).
+    """
+    runs = [run_once(data_dir, leagues, output_format, column_names, layout=layout) for _ in range(repeat)]
+    memory = run_once(data_dir, leagues, output_format, column_names, layout=layout, trace_memory=True)
+    # Stages the engine did not run (e.g. no per_90 columns) total nothing
+    empty = {"wall_seconds": 0.0, "peak_memory_mb": None}
+    total_files, total_bytes, total_rows = raw_input_stats(data_dir, leagues, layout=layout)
+
+    stages = {}
+    for stage in STAGES:
+        seconds = min(run.get(stage, empty)["wall_seconds"] for run in runs)
+        stages[stage] = {
+            "seconds": seconds,
+            "rows_per_second": total_rows / seconds if seconds else None,
+            "peak_mb": memory.get(stage, empty)["peak_memory_mb"],
+        }
+    stages["read"]["mb_per_second"] = (
+        total_bytes / (1024 * 1024) / stages["read"]["seconds"] if stages["read"]["seconds"] else None
+    )
+
+    return {
+        "leagues": len(leagues),
+        "layout": layout,
+        "raw_files": total_files,
+        "raw_rows": total_rows,
+        "raw_bytes": total_bytes,
+        "repeat": repeat,
+        "output_format": output_format,
+        "total_seconds": sum(stage["seconds"] for stage in stages.values()),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": stages,
+    }
+
+
+def print_report(report):
+    """Print a per-stage timing table"""
+    print("-" * 60)
+    print(f"{'stage':<14}{'seconds':>10}{'rows/s':>14}{'peak MiB':>12}")
+    for stage, result in report["stages"].items():
+        rate = f"{result['rows_per_second']:,.0f}" if result["rows_per_second"] else "-"
+        peak = f"{result['peak_mb']:.1f}" if result.get("peak_mb") is not None else "-"
+        print(f"{stage:<14}{result['seconds']:>10.4f}{rate:>14}{peak:>12}")
+    print("-" * 60)
+    read_rate = report["stages"]["read"].get("mb_per_second")
+    if read_rate:
+        print(f"📥 Read throughput: {read_rate:.2f} MiB/s over {report['raw_files']} files")
+    print(f"⏱️ Total: {report['total_seconds']:.4f}s (best of {report['repeat']})")
+    if report.get("peak_rss_mb"):
+        print(f"🧠 Process peak RSS: {report['peak_rss_mb']:.1f} MiB")
+
+
+def find_regressions(report, baseline, tolerance=0.25):
+    """(stage, metric, before, after) of stages over ``tolerance`` slower, or using more memory, than ``baseline``"""
+    regressions = []
+    for stage, result in report["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        for metric, noise_floor in (("seconds", NOISE_FLOOR_SECONDS), ("peak_mb", NOISE_FLOOR_MB)):
+            before, after = previous.get(metric), result.get(metric)
+            if before is None or after is None:
+                # Baselines from before per-stage memory was recorded
+                continue
+            if after - before > noise_floor and after > before * (1 + tolerance):
+                regressions.append((stage, metric, before, after))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the raw → processed → combined pipeline")
+    parser.add_argument("--leagues", type=int, default=10, help="synthetic leagues (default: 10)")
+    parser.add_argument(
+        "--seasons", type=int, default=1,
+        help="seasons per league; more than one writes season folders and runs the partitioned layout (default: 1)"
+    )
+    parser.add_argument("--teams", type=int, default=20, help="teams per season (default: 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, best is reported (default: 3)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the synthetic data")
+    parser.add_argument(
+        "--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="csv",
+        help="output format for the write stage (default: csv)"
+    )
+    parser.add_argument(
+        "--data-dir", default=None,
+        help="where to generate the synthetic data (default: a temporary directory)"
+    )
+    parser.add_argument("--report", default=None, help="write the JSON report to this path")
+    parser.add_argument("--baseline", default=None, help="JSON report to compare against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="allowed per-stage slow-down and memory growth versus --baseline (default: 0.25 = 25%%)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Synthesise data, benchmark each stage and check for regressions"""
+    args = parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="football_bench_") as tmp_dir:
+        data_dir = args.data_dir or tmp_dir
+        print(f"🧪 Synthesising {args.leagues} leagues × {args.seasons} seasons × {args.teams} teams in {data_dir}")
+        leagues = synthesize_raw_data(data_dir, args.leagues, args.seasons, args.teams, args.seed)
+
+        report = run_benchmark(
+            data_dir, leagues, args.repeat, args.output_format, layout=benchmark_layout(args.seasons)
+        )
+        report.update({"seasons": args.seasons, "teams": args.teams})
+
+    print_report(report)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"💾 Report saved to {args.report}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.tolerance)
+        for stage, metric, before, after in regressions:
+            if metric == "seconds":
+                print(f"❌ {stage} regressed: {before:.4f}s → {after:.4f}s")
+            else:
+                print(f"❌ {stage} memory regressed: {before:.1f} MiB → {after:.1f} MiB")
+        if regressions:
+            return 1
+        print("✅ No stage regressed beyond tolerance")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,75 +1,233 @@
 # football_data_warehouse/scripts/pipelines/combine_leagues.py
-import pandas as pd
+import argparse
 import os
 import glob
 from pathlib import Path
 import sys
+import time
+from contextlib import nullcontext
 
-def main():
+# Only pandas-free modules at import time, so --help and argument errors
+# (also through pipeline.py combine) return quickly; pandas and the table
+# readers/writers are imported where they are used.
+from process.formats import COMPACT_RTOL, OUTPUT_FORMATS, output_path as table_path
+from process.instrument import Instrumentation, chrome_trace, default_report_path, stage, write_report
+from process.manifest import (
+    fingerprint_file,
+    fingerprint_files,
+    get_manifest_path,
+    hash_payload,
+    load_manifest,
+    save_manifest,
+    stale_reason,
+)
+from process.partitions import LAYOUTS, find_partitions, read_partitions
+from process.specs import LEAGUES
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Combine processed league tables into one dataset")
+    parser.add_argument(
+        "--input-format", choices=sorted(OUTPUT_FORMATS), default="csv",
+        help="format of the processed league tables to read (default: csv)"
+    )
+    parser.add_argument(
+        "--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="csv",
+        help="file format of the combined dataset (default: csv)"
+    )
+    parser.add_argument(
+        "--float-dtype", choices=["float32", "float64"], default=None,
+        help="stored float type for parquet/feather outputs (default: keep float64)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="store parquet/feather outputs compactly: float32 where every value round-trips "
+             "within tolerance, int32 counts and categorical team/league/season keys"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="skip the combine when no processed league table changed since the last run"
+    )
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="flat",
+        help="processed storage to read: one file per league (flat) or league=/season= "
+             "partitions (default: flat)"
+    )
+    parser.add_argument(
+        "--stream", action="store_true",
+        help="append one league table at a time to the output instead of combining all in memory"
+    )
+    parser.add_argument(
+        "--league", dest="leagues", action="append", default=None,
+        help="with --layout partitioned, only combine this league (repeatable); the result is written "
+             "to its own Combined_Leagues_Stats_league=... file"
+    )
+    parser.add_argument(
+        "--season", dest="seasons", action="append", default=None,
+        help="with --layout partitioned, only combine this season (repeatable); the result is written "
+             "to its own Combined_Leagues_Stats_season=... file"
+    )
+    parser.add_argument(
+        "--run-report", nargs="?", const="", default=None, metavar="PATH",
+        help="write a JSON report of per-stage wall/CPU time and frame shapes "
+             "(default path: data/run_reports/combined_leagues_<time>.json)"
+    )
+    parser.add_argument(
+        "--trace", default=None, metavar="PATH",
+        help="write a Chrome trace-event JSON timeline of the run (open in chrome://tracing or Perfetto)"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="with --run-report, also record each stage's peak memory (tracemalloc, slower)"
+    )
+    args = parser.parse_args(argv)
+    if args.compact and args.output_format == "csv":
+        parser.error("--compact applies to the parquet/feather formats")
+    if args.compact and args.float_dtype:
+        parser.error("--compact already picks the float types, drop --float-dtype")
+    if args.stream and args.compact:
+        parser.error("--stream writes a fixed float schema and cannot be combined with --compact")
+    if args.trace_memory and args.run_report is None and args.trace is None:
+        parser.error("--trace-memory requires --run-report or --trace")
+    if (args.leagues or args.seasons) and args.layout != "partitioned":
+        parser.error("--league/--season need --layout partitioned")
+    return args
+
+def combined_stem(leagues=None, seasons=None):
+    """File stem of the combined dataset
+
+    A combine pruned with ``leagues``/``seasons`` gets its own file naming
+    the filter (e.g. ``Combined_Leagues_Stats_league=Serie_A_season=2023-2024``),
+    so it never replaces the full dataset.
+    """
+    stem = "Combined_Leagues_Stats"
+    if leagues:
+        stem += f"_league={'+'.join(sorted(set(leagues)))}"
+    if seasons:
+        stem += f"_season={'+'.join(sorted(set(seasons)))}"
+    return stem
+
+def get_data_dirs():
+    """Return the Processed_data and Final_data directories"""
     # Get the absolute path of the current script
     script_dir = Path(__file__).parent.resolve()
     
     # Calculate the CORRECT project root path (two levels up from script)
     project_root = script_dir.parent.parent
     
-    # Set directory paths
-    processed_dir = project_root / "data" / "Processed_data"
-    final_data_dir = project_root / "data" / "Final_data"
-    
-    # Print paths for debugging
-    print(f"🔍 Processed data directory: {processed_dir}")
-    print(f"💾 Final data directory: {final_data_dir}")
-    
-    # Create final data directory if it doesn't exist
-    final_data_dir.mkdir(parents=True, exist_ok=True)
-    
+    return project_root / "data" / "Processed_data", project_root / "data" / "Final_data"
+
+def league_name(path):
+    """League of a flat processed table, from its file name"""
+    return Path(path).stem.replace("_merged_squad_stats", "")
+
+def league_order(key):
+    """Sort key of a combine key: LEAGUES order (unknown leagues last, by name), partitions sorted"""
+    if isinstance(key, tuple):
+        return key
+    return (list(LEAGUES).index(key) if key in LEAGUES else len(LEAGUES), key)
+
+def order_league_frames(league_frames):
+    """The tables in combine order, whichever were read from disk or rebuilt in memory"""
+    return dict(sorted(league_frames.items(), key=lambda item: league_order(item[0])))
+
+def league_table_paths(processed_dir, input_format="csv"):
+    """The flat processed tables of one format, in combine order"""
+    return sorted(
+        glob.glob(str(processed_dir / f"*{OUTPUT_FORMATS[input_format]}")),
+        key=lambda path: league_order(league_name(path)),
+    )
+
+def find_league_tables(processed_dir, input_format="csv", layout="flat", leagues=None, seasons=None):
+    """List the processed league table files of one format"""
+    if layout == "partitioned":
+        return [path for _, _, path in find_partitions(str(processed_dir), input_format, leagues, seasons)]
+    return league_table_paths(processed_dir, input_format)
+
+def load_league_tables(processed_dir, input_format="csv", skip=()):
+    """Read every processed league table into a {league name: DataFrame} dict
+
+    Leagues named in ``skip`` are not read.
+    """
+    from process.outputs import read_table
+
     # Verify processed directory exists
     if not processed_dir.exists():
         print(f"❌ Processed data directory does not exist: {processed_dir}")
         print("Please run the processing pipelines first")
-        return
+        return {}
     
-    # Find all CSV files in the processed directory
-    csv_files = glob.glob(str(processed_dir / "*.csv"))
+    # Find all league tables of the requested format in the processed directory
+    csv_files = league_table_paths(processed_dir, input_format)
     
     if not csv_files:
-        print(f"❌ No CSV files found in: {processed_dir}")
+        print(f"❌ No {input_format} files found in: {processed_dir}")
         print("Files in directory:")
         for f in processed_dir.iterdir():
             print(f" - {f.name}")
-        return
+        return {}
     
+    csv_files = [f for f in csv_files if league_name(f) not in skip]
     print(f"📁 Found {len(csv_files)} league files to combine")
     
-    # Initialize list to store dataframes
-    all_leagues = []
-    
+    league_frames = {}
     for file_path in csv_files:
         try:
             # Extract league name from filename
             filename = Path(file_path).stem
-            league_name = filename.replace("_merged_squad_stats", "")
-            
-            # Read CSV file
-            df = pd.read_csv(file_path)
+            league = league_name(file_path)
             
-            # Add league name column
-            df.insert(0, "League", league_name)
-            
-            all_leagues.append(df)
-            print(f"✅ Loaded {filename} with {len(df)} teams")
+            # Read league table; exact float parsing keeps the combined CSV identical to an in-memory combine
+            league_frames[league] = read_table(file_path, fmt=input_format, round_trip=True)
+            print(f"✅ Loaded {filename} with {len(league_frames[league])} teams")
             
         except Exception as e:
             print(f"❌ Error processing {Path(file_path).name}: {str(e)}")
             import traceback
             traceback.print_exc()
     
-    if not all_leagues:
-        print("❌ No valid data to combine")
-        return
+    return league_frames
+
+def load_partitions(processed_dir, input_format="csv", leagues=None, seasons=None, skip=()):
+    """Read the league=/season= partitions into a {(league, season): DataFrame} dict
+
+    Only partitions matching ``leagues``/``seasons`` are opened; those in
+    ``skip`` are not read.
+    """
+    league_frames = read_partitions(str(processed_dir), input_format, leagues, seasons, skip=skip, round_trip=True)
+    for (league, season), df in league_frames.items():
+        print(f"✅ Loaded league={league}/season={season} with {len(df)} teams")
+    return league_frames
+
+def load_tables(processed_dir, input_format="csv", layout="flat", leagues=None, seasons=None, skip=()):
+    """Read the processed tables of either layout (see load_league_tables/load_partitions)"""
+    if layout == "partitioned":
+        return load_partitions(processed_dir, input_format, leagues, seasons, skip)
+    return load_league_tables(processed_dir, input_format, skip)
+
+def combine_frames(league_frames):
+    """Concatenate league tables into the combined dataset layout
+
+    ``league_frames`` is {league name: DataFrame} for the flat layout, whose
+    combined table has no league column, or {(league, season): DataFrame}
+    for the partitioned layout, whose table keeps League and Season.
+    """
+    import pandas as pd
+
+    keyed = any(isinstance(key, tuple) for key in league_frames)
+    # Add the key columns without mutating the caller's frames
+    all_leagues = [
+        pd.concat([
+            pd.Series(key[0] if keyed else key, index=df.index, name="League"),
+            *([pd.Series(key[1], index=df.index, name="Season")] if keyed else []),
+            df,
+        ], axis=1)
+        for key, df in league_frames.items()
+    ]
     
     # Concatenate all dataframes
     combined_df = pd.concat(all_leagues, ignore_index=True)
+    if keyed:
+        return combined_df.rename(columns={'Squad': 'team'})
     
     # MODIFICATION START: Drop 'League' and rename 'Squad' to 'team'
     # Drop League column if it exists
@@ -81,19 +239,213 @@ def main():
         combined_df.rename(columns={'Squad': 'team'}, inplace=True)
     # MODIFICATION END
     
+    return combined_df
+
+def stream_sources(processed_dir, input_format="csv", layout="flat", leagues=None, seasons=None):
+    """List (combine key, path) of the tables to stream, in the order a full combine reads them"""
+    if layout == "partitioned":
+        return [
+            ((league, season), path)
+            for league, season, path in find_partitions(str(processed_dir), input_format, leagues, seasons)
+        ]
+    return [(league_name(path), path) for path in league_table_paths(processed_dir, input_format)]
+
+def stream_combine(processed_dir, output_path, input_format="csv", output_format="csv", float_dtype=None,
+                   layout="flat", leagues=None, seasons=None):
+    """Combine the league tables one at a time, appending each to the output
+
+    The output columns are the union of every table's columns, read from
+    the file headers only; stat columns are stored as float64 (or
+    ``float_dtype`` in the columnar formats). Only one league table is in
+    memory at a time. Returns (tables, rows) written.
+    """
+    from process.outputs import TableAppender, read_columns, read_table
+
+    sources = stream_sources(processed_dir, input_format, layout, leagues, seasons)
+    if not sources:
+        print(f"❌ No {input_format} league tables found in: {processed_dir}")
+        return 0, 0
+    print(f"📁 Found {len(sources)} league files to stream")
+    
+    key_columns = ["League", "Season"] if layout == "partitioned" else []
+    with stage("schema", format=input_format):
+        stat_columns = dict.fromkeys(
+            "team" if col == "Squad" else col
+            for _, path in sources
+            for col in read_columns(path, input_format)
+        )
+    columns = key_columns + list(stat_columns)
+    
+    with TableAppender(output_path, output_format, columns, key_columns + ["team"], float_dtype) as appender:
+        for key, path in sources:
+            with stage("combine_block", path=Path(path).name) as block:
+                league_df = block.output(combine_frames({key: read_table(path, fmt=input_format, round_trip=True)}))
+                appender.append(league_df)
+            print(f"✅ Appended {Path(path).parent.name if layout == 'partitioned' else Path(path).stem} "
+                  f"with {len(league_df)} teams")
+    return len(sources), appender.rows
+
+def load_combined(input_format="csv", columns=None, compact=False, rtol=COMPACT_RTOL, leagues=None, seasons=None):
+    """Read the combined dataset from Final_data
+
+    With ``compact`` it is returned with float32 (where every value is
+    within ``rtol``), int32 and categorical key columns, see compact_frame.
+    ``leagues``/``seasons`` read the file of a pruned partitioned combine.
+    """
+    from process.outputs import read_table
+
+    _, final_data_dir = get_data_dirs()
+    path = table_path(final_data_dir, combined_stem(leagues, seasons), input_format)
+    return read_table(path, columns=columns, fmt=input_format, compact=compact, rtol=rtol)
+
+def main(input_format="csv", output_format="csv", float_dtype=None, league_frames=None, incremental=False,
+         layout="flat", leagues=None, seasons=None, compact=False, stream=False, partial=False):
+    """Combine the processed league tables into the final dataset
+
+    When ``league_frames`` ({league name: DataFrame}, or {(league, season):
+    DataFrame} for the partitioned layout) is given, those in-memory tables
+    are combined and Processed_data is not read.
+    With ``incremental`` the combine is skipped if no processed table
+    changed since the last run; otherwise in-memory tables are completed
+    with the unchanged leagues from Processed_data, as they are when
+    ``partial`` says only some leagues were rebuilt. ``leagues``/``seasons``
+    limit which partitions are read in the partitioned layout, and such a
+    pruned combine is written to its own file (see combined_stem). With
+    ``compact`` parquet/feather outputs store compact dtypes. With
+    ``stream`` the tables are read from Processed_data and appended to the
+    output one at a time (see stream_combine). Returns True when the
+    combined dataset was written or is up to date, False when there was
+    nothing to combine (load_combined reads the result back).
+    """
+    from process.outputs import compact_frame, write_table
+
+    processed_dir, final_data_dir = get_data_dirs()
+    # A pruned combine is written beside the full dataset, not over it
+    output_path = table_path(final_data_dir, combined_stem(leagues, seasons), output_format)
+    
+    # With in-memory tables the freshly written league files are in output_format
+    table_format = output_format if league_frames is not None else input_format
+    if incremental:
+        manifest_path = get_manifest_path(str(processed_dir.parent))
+        manifest = load_manifest(manifest_path)
+        entry = manifest["combined"]
+        inputs = fingerprint_files(
+            find_league_tables(processed_dir, table_format, layout, leagues, seasons),
+            entry.get("inputs"),
+            root=str(processed_dir) if layout == "partitioned" else None,
+        )
+        spec_hash = hash_payload({"output_format": output_format, "float_dtype": float_dtype})
+        if compact:
+            spec_hash = hash_payload({"spec": spec_hash, "compact": True})
+        if layout == "partitioned":
+            spec_hash = hash_payload({"spec": spec_hash, "layout": layout, "leagues": leagues, "seasons": seasons})
+        reason = stale_reason(entry, inputs, spec_hash, output_path)
+        if reason is None:
+            print(f"⏭️ Combined dataset is up to date: {output_path}")
+            return True
+        print(f"🔁 Rebuilding combined dataset: {reason}")
+    
+    # Print paths for debugging
+    if league_frames is None:
+        print(f"🔍 Processed data directory: {processed_dir}")
+    print(f"💾 Final data directory: {final_data_dir}")
+    
+    # Create final data directory if it doesn't exist
+    final_data_dir.mkdir(parents=True, exist_ok=True)
+    
+    if stream:
+        if league_frames is not None or compact:
+            raise ValueError("stream combines the stored league tables and cannot take league_frames or compact")
+        tables, rows = stream_combine(
+            processed_dir, output_path, input_format, output_format, float_dtype, layout, leagues, seasons
+        )
+        if not tables:
+            return False
+        if incremental:
+            manifest["combined"] = {
+                "inputs": inputs, "spec_hash": spec_hash, "output": fingerprint_file(output_path),
+            }
+            save_manifest(manifest, manifest_path)
+        print(f"\n🏆 Successfully streamed {tables} leagues")
+        print(f"📊 Total teams: {rows}")
+        print(f"💾 Saved to: {output_path}")
+        return True
+    
+    if league_frames is None:
+        with stage("load", format=input_format) as load:
+            league_frames = load.output(load_tables(processed_dir, input_format, layout, leagues, seasons))
+    else:
+        print(f"🧠 Combining {len(league_frames)} league tables from memory")
+        if incremental or partial:
+            # Unchanged leagues were not rebuilt, so read them back from disk
+            with stage("load", format=table_format) as load:
+                league_frames = {
+                    **load.output(load_tables(
+                        processed_dir, table_format, layout, leagues, seasons, skip=league_frames
+                    )),
+                    **league_frames,
+                }
+        # Keep the combined table in the usual league/partition order, whatever was rebuilt
+        league_frames = order_league_frames(league_frames)
+    
+    if not league_frames:
+        print("❌ No valid data to combine")
+        return False
+    
+    with stage("combine", league_frames) as combine:
+        combined_df = combine.output(combine_frames(league_frames))
+    
+    stored_df = combined_df
+    if compact:
+        full_mb = combined_df.memory_usage(deep=True).sum() / (1024 * 1024)
+        combined_df = compact_frame(combined_df)
+        compact_mb = combined_df.memory_usage(deep=True).sum() / (1024 * 1024)
+        print(f"🗜️ Compact combined frame: {full_mb:.2f} MiB → {compact_mb:.2f} MiB")
+        # CSV keeps the full-precision text; the columnar formats store the compact dtypes
+        if output_format != "csv":
+            stored_df = combined_df
+    
     # Save combined data
-    output_path = final_data_dir / "Combined_Leagues_Stats.csv"
-    combined_df.to_csv(output_path, index=False)
+    with stage("write", stored_df, format=output_format):
+        write_table(stored_df, output_path, output_format, float_dtype=float_dtype)
     
-    print(f"\n🏆 Successfully combined {len(all_leagues)} leagues")
+    if incremental:
+        manifest["combined"] = {
+            "inputs": inputs, "spec_hash": spec_hash, "output": fingerprint_file(output_path),
+        }
+        save_manifest(manifest, manifest_path)
+    
+    print(f"\n🏆 Successfully combined {len(league_frames)} leagues")
     print(f"📊 Total teams: {len(combined_df)}")
     print(f"💾 Saved to: {output_path}")
+    return True
 
-if __name__ == "__main__":
+def run(argv=None):
+    """Parse the command line and run the combine step; returns its success flag"""
+    args = parse_args(argv)
     print("=" * 60)
     print("🏁 STARTING LEAGUE DATA COMBINATION PROCESS")
     print("=" * 60)
-    main()
+    started = time.time()
+    recorder = Instrumentation(args.trace_memory)
+    instrument = args.run_report is not None or args.trace is not None
+    with recorder.activate() if instrument else nullcontext():
+        success = main(
+            args.input_format, args.output_format, args.float_dtype, incremental=args.incremental,
+            layout=args.layout, leagues=args.leagues, seasons=args.seasons, compact=args.compact,
+            stream=args.stream,
+        )
+    if args.run_report is not None:
+        report_path = args.run_report or default_report_path(str(get_data_dirs()[0].parent), "combined_leagues")
+        write_report(recorder.report("combined_leagues", started, argv), report_path)
+        print(f"📈 Run report saved to {report_path}")
+    if args.trace:
+        write_report(chrome_trace(recorder.records, started), args.trace)
+        print(f"🧵 Trace saved to {args.trace}")
     print("=" * 60)
-    print("🏁 PROCESS COMPLETE")
-    print("=" * 60)
\ No newline at end of file
+    print("🏁 PROCESS COMPLETE" if success else "🏁 PROCESS FAILED")
+    print("=" * 60)
+    return success
+
+if __name__ == "__main__":
+    sys.exit(0 if run() else 1)
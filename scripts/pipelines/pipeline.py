@@ -0,0 +1,141 @@
+# football_data_warehouse/scripts/pipelines/pipeline.py
+import argparse
+import json
+import os
+import sys
+
+# Keep this module free of pandas/numpy: --help, --list-leagues and status
+# are used as quick health probes, so the heavy pipeline modules are only
+# imported by the subcommands that run them.
+from process.formats import OUTPUT_FORMATS, output_path as table_path
+from process.manifest import changed_files, fingerprint_files, get_manifest_path, load_manifest, manifest_key
+from process.partitions import LAYOUTS
+from process.specs import LEAGUES, get_data_dir, job_label, league_input_paths, league_jobs, processed_path_for
+
+# Subcommands that hand their remaining arguments to an existing script
+DELEGATED_COMMANDS = {
+    "process": "process the raw league files (see process_pipelines.py --help)",
+    "plan": "show what process would read, rebuild and output, without loading data (process --plan)",
+    "combine": "combine the processed league tables (see combined_leagues.py --help)",
+    "bench": "benchmark the pipeline on synthetic data (see benchmark_pipeline.py --help)",
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Football data warehouse pipeline",
+        epilog="Arguments after process/plan/combine/bench are passed to that step, e.g. 'process --workers 4'",
+    )
+    parser.add_argument("--list-leagues", action="store_true", help="list the configured leagues and exit")
+    commands = parser.add_subparsers(dest="command", metavar="{process,plan,combine,status,bench}")
+    for name, help_text in DELEGATED_COMMANDS.items():
+        # The step's own parser handles its options (and --help)
+        commands.add_parser(name, help=help_text, add_help=False)
+
+    status = commands.add_parser("status", help="check raw inputs and outputs without loading any data")
+    status.add_argument(
+        "--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="csv",
+        help="format of the processed tables to look for (default: csv)"
+    )
+    status.add_argument(
+        "--layout", choices=LAYOUTS, default="flat",
+        help="layout of the processed tables to look for (default: flat)"
+    )
+    status.add_argument("--json", action="store_true", help="print the status as JSON")
+
+    args, rest = parser.parse_known_args(argv)
+    if args.command not in DELEGATED_COMMANDS and rest:
+        parser.error(f"unrecognized arguments: {' '.join(rest)}")
+    if args.command is None and not args.list_leagues:
+        parser.error("a command is required")
+    return args, rest
+
+def list_leagues():
+    for league, name in LEAGUES.items():
+        print(f"{league:<16} {name}")
+
+def league_status(league, season, data_dir, manifest, output_format="csv", layout="flat"):
+    """Raw-file, output and manifest state of one (league, season) build
+
+    Only file listings and stats are used; an input is re-hashed only when
+    its size or mtime differs from the manifest.
+    """
+    inputs = league_input_paths(league, data_dir, season=season)
+    missing = [os.path.basename(path) for path in inputs if not os.path.exists(path)]
+    output = processed_path_for(league, data_dir, output_format, season, layout)
+    entry = manifest["leagues"].get(manifest_key(league, season))
+    changed = None
+    if entry:
+        present = [path for path in inputs if os.path.exists(path)]
+        changed = changed_files(entry.get("inputs"), fingerprint_files(present, entry.get("inputs")))
+    return {
+        "league": league,
+        "season": season,
+        "raw_files": len(inputs) - len(missing),
+        "raw_expected": len(inputs),
+        "missing_raw": missing,
+        "output": output,
+        "output_exists": os.path.exists(output),
+        "tracked": entry is not None,
+        "changed_inputs": changed,
+    }
+
+def status(output_format="csv", layout="flat", as_json=False):
+    """Print the pipeline status; returns 1 if any input or output is missing"""
+    data_dir = get_data_dir()
+    manifest = load_manifest(get_manifest_path(data_dir))
+    jobs = league_jobs(LEAGUES, layout, data_dir)
+    if layout == "partitioned":
+        # Leagues without any season folder still need reporting
+        jobs += [(league, None) for league in LEAGUES if league not in {job[0] for job in jobs}]
+    leagues = [league_status(league, season, data_dir, manifest, output_format, layout) for league, season in jobs]
+    combined = table_path(os.path.join(data_dir, "Final_data"), "Combined_Leagues_Stats", output_format)
+    healthy = all(not s["missing_raw"] and s["output_exists"] for s in leagues) and os.path.exists(combined)
+
+    if as_json:
+        print(json.dumps({
+            "healthy": healthy, "leagues": leagues,
+            "combined": {"output": combined, "output_exists": os.path.exists(combined)},
+        }, indent=2))
+        return 0 if healthy else 1
+
+    print("=" * 60)
+    print("🩺 PIPELINE STATUS")
+    print("=" * 60)
+    for s in leagues:
+        ok = not s["missing_raw"] and s["output_exists"]
+        notes = []
+        if s["missing_raw"]:
+            notes.append(f"missing {', '.join(s['missing_raw'])}")
+        if not s["output_exists"]:
+            notes.append("not built")
+        if s["changed_inputs"]:
+            notes.append(f"inputs changed since last incremental build: {', '.join(s['changed_inputs'])}")
+        raw = f"{s['raw_files']}/{s['raw_expected']} raw"
+        label = job_label(s["league"], s["season"])
+        print(f"{'✅' if ok else '❌'} {label:<20} {raw:<10} {'; '.join(notes)}".rstrip())
+    print(f"{'✅' if os.path.exists(combined) else '❌'} Combined dataset: {combined}")
+    return 0 if healthy else 1
+
+def main(argv=None):
+    args, rest = parse_args(argv)
+    if args.list_leagues:
+        list_leagues()
+        return 0
+    if args.command == "status":
+        return status(args.output_format, args.layout, args.json)
+    if args.command in ("process", "plan"):
+        import process_pipelines
+
+        return 0 if process_pipelines.main(["--plan", *rest] if args.command == "plan" else rest) else 1
+    if args.command == "combine":
+        import combined_leagues
+
+        return 0 if combined_leagues.run(rest) else 1
+    if args.command == "bench":
+        import benchmark_pipeline
+
+        return benchmark_pipeline.main(rest)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""League processing engine for the football data warehouse pipelines"""
@@ -0,0 +1,190 @@
+# football_data_warehouse/scripts/pipelines/process/catalog.py
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+from .loader import read_raw_csv
+from .partitions import DEFAULT_SEASON
+from .schema import get_schema
+from .specs import STAT_CATEGORIES, get_data_dir
+
+# Default memory budget of the frames a catalog keeps loaded
+DEFAULT_CATALOG_MB = 512
+
+# Raw league folders are named <League>_data
+LEAGUE_DIR_SUFFIX = "_data"
+
+
+@dataclass(frozen=True)
+class RawFile:
+    """One raw CSV found by the catalog scan"""
+    key: str
+    league: str
+    season: str
+    stem: str
+    path: str
+    size: int
+    mtime_ns: int
+
+
+def _csv_entries(directory):
+    return sorted(
+        (entry for entry in os.scandir(directory) if entry.is_file() and entry.name.endswith(".csv")),
+        key=lambda entry: entry.name,
+    )
+
+
+def scan_raw_files(raw_dir):
+    """Index the raw CSVs under ``raw_dir`` by ``<League>_data[/<season>]/<file stem>``
+
+    Files directly in a league folder are its DEFAULT_SEASON; season
+    sub-folders add the season to the key.
+    """
+    files = {}
+    if not os.path.isdir(raw_dir):
+        return files
+    for league_entry in sorted(os.scandir(raw_dir), key=lambda entry: entry.name):
+        if not league_entry.is_dir() or not league_entry.name.endswith(LEAGUE_DIR_SUFFIX):
+            continue
+        league = league_entry.name[:-len(LEAGUE_DIR_SUFFIX)]
+        folders = [(DEFAULT_SEASON, league_entry.path, league_entry.name)] + [
+            (entry.name, entry.path, f"{league_entry.name}/{entry.name}")
+            for entry in sorted(os.scandir(league_entry.path), key=lambda entry: entry.name)
+            if entry.is_dir() and not entry.name.startswith(".")
+        ]
+        for season, folder, prefix in folders:
+            for entry in _csv_entries(folder):
+                stem = entry.name[:-len(".csv")]
+                key = f"{prefix}/{stem}"
+                stat = entry.stat()
+                files[key] = RawFile(key, league, season, stem, entry.path, stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+class RawCatalog(Mapping):
+    """Lazy, memoised access to the raw FBref files
+
+    The raw directories are scanned once, when the catalog is created. A
+    file is parsed (see loader.read_raw_csv) only when it is first accessed
+    and then kept in an LRU memo bounded by ``max_mb`` of DataFrame memory;
+    the frame just loaded is always kept. Keys follow the raw layout, e.g.
+    ``catalog["Premier_League_data/Squad_Standard_Stats"]``, and
+    ``catalog.load(key, columns=[...])`` parses only those columns. As a
+    Mapping, ``values()``/``items()`` load every file.
+    """
+
+    def __init__(self, raw_dir=None, max_mb=DEFAULT_CATALOG_MB, column_names="legacy", parse_cache=None):
+        self.raw_dir = raw_dir or os.path.join(get_data_dir(), "Raw_data")
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.column_names = column_names
+        self.parse_cache = parse_cache
+        self.files = scan_raw_files(self.raw_dir)
+        # (key, columns or None) -> (frame, bytes), least recently used first
+        self._frames = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __getitem__(self, key):
+        return self.load(key)
+
+    def __iter__(self):
+        return iter(self.files)
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, key):
+        # Mapping's default would load the file
+        return key in self.files
+
+    def __repr__(self):
+        return (
+            f"<RawCatalog {len(self.files)} files, {len(self._frames)} loaded "
+            f"({self.memory_mb():.1f} MiB) in {self.raw_dir}>"
+        )
+
+    def leagues(self):
+        """League folder names with at least one raw file"""
+        return sorted({raw_file.league for raw_file in self.files.values()})
+
+    def columns(self, key):
+        """Column names of a raw file, read from its header only"""
+        return get_schema(self.files[key].path).names(self.column_names)
+
+    def load(self, key, columns=None):
+        """The frame of one raw file, parsing it on first access
+
+        With ``columns`` only those columns are parsed (they come back in
+        file order); if the whole file is already loaded they are taken
+        from it instead.
+        """
+        raw_file = self.files[key]
+        if columns is not None:
+            available = self.columns(key)
+            unknown = [col for col in columns if col not in available]
+            if unknown:
+                raise KeyError(f"{key} has no column(s) {unknown}")
+            wanted = set(columns)
+            columns = tuple(col for col in available if col in wanted)
+
+        with self._lock:
+            for memo_key in ((key, columns), (key, None)):
+                if memo_key in self._frames:
+                    self._frames.move_to_end(memo_key)
+                    df = self._frames[memo_key][0]
+                    return df if memo_key[1] == columns else df[list(columns)]
+
+        df = read_raw_csv(
+            raw_file.path, self.column_names, cache=self.parse_cache,
+            columns=list(columns) if columns is not None else None,
+        )
+        self._remember((key, columns), df)
+        return df
+
+    def table(self, league, category, opponent=False, season=None, columns=None):
+        """A stat category's squad (or opponent) table, e.g. ``table("La_Liga", "shooting")``"""
+        spec = next((spec for spec in STAT_CATEGORIES if spec.name == category), None)
+        if spec is None:
+            raise KeyError(f"Unknown category '{category}', expected one of {[spec.name for spec in STAT_CATEGORIES]}")
+        folder = f"{league}{LEAGUE_DIR_SUFFIX}"
+        if season not in (None, DEFAULT_SEASON):
+            folder = f"{folder}/{season}"
+        filename = spec.opponent_filename if opponent else spec.filename
+        return self.load(f"{folder}/{filename[:-len('.csv')]}", columns)
+
+    def _remember(self, memo_key, df):
+        size = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if memo_key in self._frames:
+                self._bytes -= self._frames.pop(memo_key)[1]
+            self._frames[memo_key] = (df, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes and len(self._frames) > 1:
+                _, (_, evicted) = self._frames.popitem(last=False)
+                self._bytes -= evicted
+
+    def loaded(self):
+        """Memoised (key, columns) entries, least recently used first"""
+        with self._lock:
+            return list(self._frames)
+
+    def memory_mb(self):
+        """Memory held by the memoised frames"""
+        return self._bytes / (1024 * 1024)
+
+    def clear(self):
+        """Forget every loaded frame"""
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    def refresh(self):
+        """Rescan the raw directories, dropping loaded frames of files that changed or went away"""
+        files = scan_raw_files(self.raw_dir)
+        with self._lock:
+            for memo_key in list(self._frames):
+                if files.get(memo_key[0]) != self.files.get(memo_key[0]):
+                    self._bytes -= self._frames.pop(memo_key)[1]
+            self.files = files
@@ -0,0 +1,40 @@
+# football_data_warehouse/scripts/pipelines/process/formats.py
+import os
+
+# Supported table formats -> file extension
+OUTPUT_FORMATS = {
+    "csv": ".csv",
+    "parquet": ".parquet",
+    "feather": ".feather",
+}
+
+# Columnar formats need pyarrow; CSV works with pandas alone
+COLUMNAR_FORMATS = ("parquet", "feather")
+
+# Largest relative error compact_frame accepts when narrowing a float column
+COMPACT_RTOL = 1e-6
+
+
+def check_format(fmt):
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{fmt}', expected one of {sorted(OUTPUT_FORMATS)}")
+    if fmt in COLUMNAR_FORMATS:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError(f"The '{fmt}' output format requires pyarrow (pip install pyarrow)") from e
+
+
+def output_path(directory, stem, fmt="csv"):
+    """Return ``directory/stem`` with the extension for ``fmt``"""
+    check_format(fmt)
+    return os.path.join(directory, f"{stem}{OUTPUT_FORMATS[fmt]}")
+
+
+def format_from_path(path):
+    """Infer the table format from a file extension"""
+    suffix = os.path.splitext(str(path))[1].lower()
+    for fmt, extension in OUTPUT_FORMATS.items():
+        if suffix == extension:
+            return fmt
+    raise ValueError(f"Cannot infer table format from {path}")
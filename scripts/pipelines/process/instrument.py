@@ -0,0 +1,261 @@
+# football_data_warehouse/scripts/pipelines/process/instrument.py
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+REPORT_VERSION = 1
+
+# Where run reports go when no explicit path is given
+REPORTS_DIR_NAME = "run_reports"
+
+# Recorder of the current process; stage() is a no-op while it is None
+_ACTIVE = None
+
+
+def frame_shape(frame):
+    """(rows, cols) of a DataFrame, or summed over a dict/list of them"""
+    if frame is None:
+        return None, None
+    if isinstance(frame, dict):
+        frame = list(frame.values())
+    if isinstance(frame, (list, tuple)):
+        shapes = [frame_shape(part) for part in frame]
+        return sum(rows or 0 for rows, _ in shapes), sum(cols or 0 for _, cols in shapes)
+    return frame.shape
+
+
+class Stage:
+    """One timed stage; ``output()`` records the shape of what it produced"""
+
+    def __init__(self, record):
+        self.record = record
+
+    def output(self, frame):
+        self.record["rows_out"], self.record["cols_out"] = frame_shape(frame)
+        return frame
+
+
+class _NullStage:
+    def output(self, frame):
+        return frame
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Instrumentation:
+    """Records wall time, CPU time, frame shapes and peak memory per stage
+
+    Stages nest: each record names its parent and inherits its labels
+    (league, season, ...). Memory is traced with tracemalloc only when
+    ``trace_memory`` is set, as tracing slows the pipeline down several
+    times; it is only measured on the thread that activated the recorder.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._owner = None
+        self._started_tracing = False
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def current_labels(self):
+        """Labels of the innermost open stage on this thread"""
+        stack = self._stack()
+        return dict(stack[-1]["labels"]) if stack else {}
+
+    @contextmanager
+    def activate(self):
+        """Make this the recorder used by stage() in this process"""
+        global _ACTIVE
+        previous, _ACTIVE = _ACTIVE, self
+        self._owner = threading.get_ident()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        try:
+            yield self
+        finally:
+            _ACTIVE = previous
+            if self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    @contextmanager
+    def stage(self, name, inputs=None, **labels):
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        labels = {**(parent["labels"] if parent else {}), **labels}
+        rows_in, cols_in = frame_shape(inputs)
+        record = {
+            "stage": name,
+            **labels,
+            "parent": parent["record"]["id"] if parent else None,
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+            "thread": threading.current_thread().name,
+            "started": time.time(),
+            "rows_in": rows_in,
+            "cols_in": cols_in,
+            "rows_out": None,
+            "cols_out": None,
+        }
+        with self._lock:
+            record["id"] = len(self.records)
+            self.records.append(record)
+
+        on_owner = threading.get_ident() == self._owner
+        trace = self.trace_memory and on_owner and tracemalloc.is_tracing()
+        frame = {"record": record, "labels": labels, "peak": 0}
+        if trace:
+            current, peak = tracemalloc.get_traced_memory()
+            if parent:
+                parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["start_memory"] = current
+        # process_time() would include the reader threads, so use thread_time() off the owner thread
+        cpu_clock = time.process_time if on_owner else time.thread_time
+        stack.append(frame)
+        wall_start, cpu_start = time.perf_counter(), cpu_clock()
+        try:
+            yield Stage(record)
+        finally:
+            record["wall_seconds"] = time.perf_counter() - wall_start
+            record["cpu_seconds"] = cpu_clock() - cpu_start
+            stack.pop()
+            if trace:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                record["peak_memory_mb"] = (peak - frame["start_memory"]) / (1024 * 1024)
+                if parent:
+                    parent["peak"] = max(parent["peak"], peak)
+            else:
+                record["peak_memory_mb"] = None
+
+    def summary(self):
+        """Totals per stage name: count, wall and CPU seconds, largest peak"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record["stage"], {
+                "count": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_memory_mb": None
+            })
+            total["count"] += 1
+            total["wall_seconds"] += record.get("wall_seconds", 0.0)
+            total["cpu_seconds"] += record.get("cpu_seconds", 0.0)
+            if record.get("peak_memory_mb") is not None:
+                total["peak_memory_mb"] = max(total["peak_memory_mb"] or 0.0, record["peak_memory_mb"])
+        return totals
+
+    def extend(self, records):
+        """Add records collected in another process (e.g. a pool worker)"""
+        with self._lock:
+            offset = len(self.records)
+            for record in records:
+                self.records.append({
+                    **record,
+                    "id": record["id"] + offset,
+                    "parent": None if record["parent"] is None else record["parent"] + offset,
+                })
+
+    def report(self, command, started, argv=None):
+        """The JSON-serialisable run report"""
+        return {
+            "version": REPORT_VERSION,
+            "command": command,
+            "argv": list(sys.argv[1:] if argv is None else argv),
+            "started": started,
+            "wall_seconds": time.time() - started,
+            "trace_memory": self.trace_memory,
+            "summary": self.summary(),
+            "stages": self.records,
+        }
+
+
+# Record fields that are not shown as span arguments in a trace
+_SPAN_FIELDS = ("stage", "id", "parent", "pid", "tid", "thread", "started", "wall_seconds")
+
+
+def span_name(record):
+    """Trace span title, e.g. ``read_file Squad_Standard_Stats.csv``"""
+    if record.get("file"):
+        detail = record["file"]
+    elif record.get("category"):
+        detail = record["category"] + (" (opponent)" if record.get("opponent") else "")
+    else:
+        detail = " ".join(str(record[key]) for key in ("league", "season") if record.get(key))
+    return f"{record['stage']} {detail}".strip()
+
+
+def chrome_trace(records, started=None):
+    """Convert stage records into Chrome trace-event JSON
+
+    Each stage becomes a complete ("X") event on its process and thread, so
+    pool workers and reader threads show up as separate tracks in
+    chrome://tracing or Perfetto.
+    """
+    if started is None:
+        started = min((record["started"] for record in records), default=0.0)
+
+    events, threads = [], {}
+    for record in records:
+        threads.setdefault((record["pid"], record["tid"]), record["thread"])
+        events.append({
+            "name": span_name(record),
+            "cat": record["stage"],
+            "ph": "X",
+            "ts": (record["started"] - started) * 1e6,
+            "dur": record.get("wall_seconds", 0.0) * 1e6,
+            "pid": record["pid"],
+            "tid": record["tid"],
+            "args": {key: value for key, value in record.items() if key not in _SPAN_FIELDS},
+        })
+
+    main_pid = os.getpid()
+    for pid in sorted({pid for pid, _ in threads}):
+        name = "main" if pid == main_pid else f"worker {pid}"
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}})
+    for (pid, tid), thread in threads.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+@contextmanager
+def stage(name, inputs=None, **labels):
+    """Time a pipeline stage on the active recorder (no-op when none is active)
+
+    ``inputs`` is the frame (or frames) the stage consumes; call
+    ``.output(frame)`` on the yielded stage to record what it produced.
+    """
+    if _ACTIVE is None:
+        yield _NULL_STAGE
+        return
+    with _ACTIVE.stage(name, inputs, **labels) as active_stage:
+        yield active_stage
+
+
+def current_labels():
+    """Labels of the innermost open stage, to carry into worker threads"""
+    return _ACTIVE.current_labels() if _ACTIVE is not None else {}
+
+
+def default_report_path(data_dir, command):
+    """``data/run_reports/<command>_<timestamp>.json``"""
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(data_dir, REPORTS_DIR_NAME, f"{command}_{stamp}.json")
+
+
+def write_report(report, path):
+    """Write a run report (or trace) as JSON, creating its directory"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return path
@@ -0,0 +1,323 @@
+# football_data_warehouse/scripts/pipelines/process/league_engine.py
+import os
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+from .instrument import stage
+from .loader import load_league_files
+from .outputs import read_table, write_table
+from .specs import (
+    COLUMNS_TO_DROP,
+    LEAGUES,
+    STAT_CATEGORIES,
+    get_data_dir,
+    processed_path_for,
+    raw_data_dir_for,
+    raw_file_paths,
+    resolve_league_categories,
+)
+
+
+def compute_per_90(df, columns, base_col):
+    """Divide a block of columns by the base column in one vectorised pass
+
+    Rows where the base column is zero get 0 instead of inf/NaN. Returns a
+    new frame of ``<col>_per_90`` columns sharing ``df``'s index.
+    """
+    columns = list(columns)
+    values = df[columns].to_numpy(dtype=np.float64)
+    base = df[base_col].to_numpy(dtype=np.float64)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        per_90 = values / base[:, np.newaxis]
+    per_90[base == 0] = 0
+
+    return pd.DataFrame(per_90, index=df.index, columns=[f'{col}_per_90' for col in columns])
+
+
+def canonical_squads(squads, is_opponent=False):
+    """Squad names with the "vs " prefix of opponent tables removed"""
+    return squads.str.replace('^vs ', '', regex=True) if is_opponent else squads
+
+
+def build_team_index(raw_dfs):
+    """Sorted canonical team names across every raw table of a league
+
+    A team's code is its position in this index, so sorting by code is
+    sorting by name. Returns None when a table has a missing squad name,
+    in which case the league is processed on the names themselves.
+    """
+    names = []
+    for (_, is_opponent), df in raw_dfs.items():
+        if df['Squad'].isna().any():
+            return None
+        names.append(canonical_squads(df['Squad'], is_opponent))
+    return pd.Index(pd.concat(names).unique()).sort_values()
+
+
+def encode_squads(raw_dfs, team_index):
+    """Replace Squad with int32 team codes in every raw table
+
+    Opponent names are resolved to their canonical team here, so the later
+    per-table transform and all merges hash small integers, not strings.
+    """
+    encoded = {}
+    for key, df in raw_dfs.items():
+        codes = team_index.get_indexer(canonical_squads(df['Squad'], key[1])).astype(np.int32)
+        encoded[key] = df.assign(Squad=codes)
+    return encoded
+
+
+def decode_squads(df, team_index):
+    """Turn Squad codes back into team names"""
+    return df.assign(Squad=team_index.take(df['Squad'].to_numpy()))
+
+
+def process_stats(df, category, is_opponent=False):
+    """Convert a raw category dataframe to per-90 stats using its spec"""
+    per_90 = compute_per_90(df, category.divide_cols, category.base_col)
+    # Unused drop columns may already have been skipped at read time
+    drop_cols = [col for col in dict.fromkeys(category.drop_cols + category.divide_cols) if col in df.columns]
+    df = pd.concat([df.drop(columns=drop_cols), per_90], axis=1)
+
+    if is_opponent:
+        # Encoded tables (see encode_squads) already hold canonical team codes
+        if not pd.api.types.is_integer_dtype(df['Squad']):
+            df['Squad'] = canonical_squads(df['Squad'], is_opponent=True)
+        rename_dict = {col: f"{col}_against" for col in df.columns if col != 'Squad'}
+        df.rename(columns=rename_dict, inplace=True)
+
+    return df
+
+
+def merge_category_pair(squad_df, opponent_df, category, team_index=None):
+    """Merge processed squad and opponent frames on Squad and prefix the columns"""
+    pair = [squad_df, opponent_df]
+    orders = shared_team_order(pair) if can_align_categories(pair) else None
+    if orders is not None:
+        category_df = stack_on_squad(pair, orders)
+    else:
+        report_team_mismatch(pair, f"{category.name} squad/opponent", team_index)
+        category_df = pd.merge(squad_df, opponent_df, on='Squad', how='inner')
+
+    category_df = category_df.drop(
+        columns=[col for col in COLUMNS_TO_DROP if col in category_df.columns], errors='ignore'
+    )
+    return category_df.rename(columns={
+        col: category.prefix + col if col != 'Squad' else col
+        for col in category_df.columns
+    })
+
+
+def process_category(squad_df, opponent_df, category, squad_category=None, opponent_category=None,
+                     team_index=None):
+    """Process a category's squad and opponent frames and merge them on Squad
+
+    ``squad_category``/``opponent_category`` are the spec resolved against
+    each file's header (see resolve_category); they default to ``category``.
+    """
+    with stage("per_90", squad_df, category=category.name, opponent=False) as per_90:
+        squad_stats = per_90.output(process_stats(squad_df, squad_category or category))
+    with stage("per_90", opponent_df, category=category.name, opponent=True) as per_90:
+        opponent_stats = per_90.output(
+            process_stats(opponent_df, opponent_category or category, is_opponent=True)
+        )
+    with stage("pair_merge", [squad_stats, opponent_stats], category=category.name) as pair_merge:
+        return pair_merge.output(merge_category_pair(squad_stats, opponent_stats, category, team_index))
+
+
+def can_align_categories(category_dfs):
+    """True when the tables have unique squads and no shared value columns"""
+    seen_columns = set()
+    for df in category_dfs:
+        if not df['Squad'].is_unique:
+            return False
+        value_columns = set(df.columns) - {'Squad'}
+        if seen_columns & value_columns:
+            return False
+        seen_columns |= value_columns
+    return True
+
+
+def shared_team_order(dfs):
+    """Row orders that sort each table by Squad, or None if the team sets differ
+
+    Every table's keys are sorted once and compared in a single vectorised
+    check; matching tables can then be joined by position.
+    """
+    keys = [df['Squad'].to_numpy() for df in dfs]
+    if len({len(key) for key in keys}) != 1 or any(pd.isna(key).any() for key in keys):
+        return None
+
+    orders = [np.argsort(key, kind='stable') for key in keys]
+    sorted_keys = np.vstack([key[order] for key, order in zip(keys, orders)])
+    if not (sorted_keys == sorted_keys[0]).all():
+        return None
+    return orders
+
+
+def stack_on_squad(dfs, orders):
+    """Join tables that share one team set by putting their sorted rows side by side"""
+    index = pd.RangeIndex(len(orders[0]))
+    blocks = []
+    for position, (df, order) in enumerate(zip(dfs, orders)):
+        block = df.take(order)
+        # The same RangeIndex on every block lets concat stack without aligning
+        block.index = index
+        if position:
+            # Slicing off a leading Squad is far cheaper than drop() on a wide table
+            block = block.iloc[:, 1:] if block.columns[0] == 'Squad' else block.drop(columns='Squad')
+        blocks.append(block)
+    return pd.concat(blocks, axis=1)
+
+
+def mismatched_teams(dfs, team_index=None):
+    """Sorted names of the teams missing from at least one table"""
+    key_sets = [set(df['Squad'].dropna()) for df in dfs]
+    mismatched = sorted(set.union(*key_sets) - set.intersection(*key_sets))
+    if team_index is not None:
+        mismatched = list(team_index.take(mismatched))
+    return mismatched
+
+
+def report_team_mismatch(dfs, label, team_index=None):
+    """Warn about the teams that force a general (hash) join"""
+    mismatched = mismatched_teams(dfs, team_index)
+    if mismatched:
+        print(f"⚠️ Team sets differ across {label} tables, using the general join: {', '.join(map(str, mismatched))}")
+
+
+def merge_categories(category_dfs, team_index=None):
+    """Outer-join every category table of a league on Squad
+
+    When every table lists the same teams once, the tables are sorted and
+    stacked side by side without a join. Otherwise each table is indexed on
+    Squad and all are aligned in a single column concat. Either way rows
+    come out sorted by Squad with NaN for missing squads, exactly like
+    ``reduce(pd.merge(how='outer'))``, which is still used when squads
+    repeat or value columns collide.
+    """
+    if len(category_dfs) == 1:
+        return category_dfs[0]
+
+    if not can_align_categories(category_dfs):
+        return reduce(
+            lambda left, right: pd.merge(left, right, on='Squad', how='outer'),
+            category_dfs
+        )
+
+    orders = shared_team_order(category_dfs)
+    if orders is not None:
+        return stack_on_squad(category_dfs, orders)
+    report_team_mismatch(category_dfs, "category", team_index)
+
+    merged = pd.concat([df.set_index('Squad') for df in category_dfs], axis=1, join='outer')
+    # An outer merge sorts the keys even when every table has the same squads
+    merged = merged.sort_index()
+    # Concat rather than reset_index(), which inserts into a many-block frame
+    merged = pd.concat([pd.Series(merged.index, name='Squad'), merged.reset_index(drop=True)], axis=1)
+    if category_dfs[0].columns[0] != 'Squad':
+        # A merge keeps Squad where the first table has it
+        merged = merged[list(category_dfs[0].columns) + list(merged.columns[category_dfs[0].shape[1]:])]
+    return merged
+
+
+def splice_categories(league_df, rebuilt_df, categories, all_categories=STAT_CATEGORIES):
+    """Replace the columns of ``categories`` in a merged league table with a rebuilt slice
+
+    Each category's columns are found by its prefix; the table is then put
+    back together category by category, in ``all_categories`` order, with
+    the same outer join on Squad as a full build.
+    """
+    rebuilt = {category.name for category in categories}
+    category_dfs = []
+    for category in all_categories:
+        source = rebuilt_df if category.name in rebuilt else league_df
+        columns = [col for col in source.columns if col.startswith(category.prefix)]
+        category_dfs.append(source[['Squad'] + columns])
+    return merge_categories(category_dfs)
+
+
+def process_league(league, data_dir=None, categories=STAT_CATEGORIES, column_names="legacy",
+                   strict_schema=False, season=None, read_workers=None, parse_cache=None):
+    """Build the merged squad stats table for one league (season)
+
+    ``column_names`` picks the raw column naming: "legacy" keeps pandas'
+    ``Gls``/``Gls.1`` names (the historical output schema), "qualified"
+    uses group-qualified names such as ``Gls (Per 90 Minutes)``. With
+    ``strict_schema`` a raw file whose columns differ from its category
+    spec raises SchemaDriftError. ``season`` picks a season sub-folder of
+    the league's raw data (default: the unpartitioned snapshot).
+    ``read_workers`` caps the reader threads (1 reads in this thread).
+    ``parse_cache`` is an optional process.parse_cache.ParseCache.
+    """
+    raw_data_dir = raw_data_dir_for(league, data_dir, season)
+    with stage("read") as read:
+        raw_dfs = read.output(load_league_files(
+            raw_data_dir, categories, read_workers, column_names=column_names, strict=strict_schema,
+            cache=parse_cache,
+        ))
+    specs = resolve_league_categories(raw_file_paths(raw_data_dir, categories), categories, column_names)
+
+    # Merge on int32 team codes and only decode names for the final table
+    team_index = build_team_index(raw_dfs)
+    if team_index is not None:
+        raw_dfs = encode_squads(raw_dfs, team_index)
+
+    category_dfs = [
+        process_category(
+            raw_dfs[(category.name, False)],
+            raw_dfs[(category.name, True)],
+            category,
+            specs[(category.name, False)],
+            specs[(category.name, True)],
+            team_index,
+        )
+        for category in categories
+    ]
+    with stage("league_merge", category_dfs) as league_merge:
+        merged_df = merge_categories(category_dfs, team_index)
+        if team_index is not None:
+            merged_df = decode_squads(merged_df, team_index)
+        return league_merge.output(merged_df)
+
+
+def run_league(league, data_dir=None, output_format="csv", float_dtype=None, persist=True,
+               column_names="legacy", strict_schema=False, season=None, layout="flat", read_workers=None,
+               compact=False, categories=STAT_CATEGORIES, parse_cache=None):
+    """Process one league, save it to Processed_data and return the merged table
+
+    With ``persist=False`` nothing is written; the table is only returned,
+    e.g. to hand it straight to the combine step. ``layout`` picks the
+    flat or league=/season= partitioned storage (see processed_path_for);
+    ``compact`` stores columnar outputs with compact dtypes (see
+    outputs.compact_frame). Given only some ``categories``, just those are
+    rebuilt and spliced into the league's existing table.
+    """
+    data_dir = data_dir or get_data_dir()
+    output_path = processed_path_for(league, data_dir, output_format, season, layout)
+    with stage("league", league=league, season=season) as league_stage:
+        merged_df = league_stage.output(process_league(
+            league, data_dir, categories, column_names=column_names, strict_schema=strict_schema, season=season,
+            read_workers=read_workers, parse_cache=parse_cache,
+        ))
+
+    if set(categories) != set(STAT_CATEGORIES):
+        if not os.path.exists(output_path):
+            raise FileNotFoundError(f"No existing table to splice {league} categories into: {output_path}")
+        with stage("splice", merged_df, league=league, season=season) as splice:
+            merged_df = splice.output(splice_categories(
+                read_table(output_path, fmt=output_format, round_trip=True), merged_df, categories
+            ))
+        print(f"🧩 Spliced {', '.join(category.name for category in categories)} into {output_path}")
+
+    if persist:
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        with stage("write", merged_df, league=league, season=season, format=output_format):
+            write_table(merged_df, output_path, output_format, float_dtype=float_dtype, compact=compact)
+        label = LEAGUES.get(league, league) + (f" {season}" if season else "")
+        print(f"✅ {label} merged data saved to {output_path}")
+
+    return merged_df
@@ -0,0 +1,137 @@
+# football_data_warehouse/scripts/pipelines/process/loader.py
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+
+import pandas as pd
+
+from .instrument import current_labels, stage
+from .schema import HEADER_ROWS, get_schema
+from .specs import raw_file_paths
+
+# Upper bound on reader threads; a league has 20 raw files
+MAX_READ_THREADS = 20
+
+# Declared raw dtypes. Totals are int32 rather than int16 because season
+# distance totals (TotDist, PrgDist) overflow 32767. Rates stay float64 so the
+# per-90 and passed-through values are unchanged.
+COUNT_DTYPE = "int32"
+RATE_DTYPE = "float64"
+
+
+class SchemaDriftError(ValueError):
+    """A raw file's columns no longer match its category spec"""
+
+
+def is_count_column(name):
+    """True for raw totals (goals, passes, ...), False for rates and percentages"""
+    return "%" not in name and name != "90s"
+
+
+def column_dtypes(category):
+    """Declared dtypes of the columns a category reads, in qualified names"""
+    dtypes = {"Squad": "str"}
+    for col in (category.base_col,) + category.divide_cols:
+        dtypes[col] = COUNT_DTYPE if is_count_column(col) else RATE_DTYPE
+    for col in category.keep_cols:
+        dtypes[col] = RATE_DTYPE
+    return dtypes
+
+
+def check_columns(path, schema, category):
+    """Raise SchemaDriftError unless the file has exactly the declared columns"""
+    actual = set(schema.qualified)
+    expected = set(category.columns)
+    if actual != expected:
+        missing = sorted(expected - actual)
+        unexpected = sorted(actual - expected)
+        raise SchemaDriftError(
+            f"{os.path.basename(path)} does not match the '{category.name}' schema "
+            f"(missing: {missing or 'none'}, unexpected: {unexpected or 'none'})"
+        )
+
+
+def read_raw_csv(path, column_names="legacy", category=None, strict=False, cache=None, columns=None):
+    """Read a raw FBref export using its cached two-row header schema
+
+    The header rows are skipped and the schema's names passed explicitly,
+    so pandas does no header inference or duplicate-name mangling. Given
+    the file's ``category``, columns the transform never uses are not
+    parsed and the declared dtypes are applied; in ``strict`` mode any
+    column drift or dtype mismatch raises instead of falling back to
+    inferred types. With a ParseCache the frame comes from the binary
+    sidecar of an identical earlier parse when there is one. Without a
+    ``category``, ``columns`` limits the parse to those columns (named in
+    the ``column_names`` style, returned in file order).
+    """
+    if cache is not None:
+        options = {
+            "reader": "read_raw_csv",
+            "column_names": column_names,
+            "category": asdict(category) if category else None,
+            "strict": strict,
+            "columns": columns,
+            "dtypes": [COUNT_DTYPE, RATE_DTYPE],
+        }
+        return cache.load(path, lambda: read_raw_csv(path, column_names, category, strict, columns=columns), options)
+
+    schema = get_schema(path)
+    names = list(schema.names(column_names))
+    if category is None:
+        return pd.read_csv(path, skiprows=HEADER_ROWS, header=None, names=names, usecols=columns)
+
+    if strict:
+        check_columns(path, schema, category)
+
+    unread = set(schema.translate(category.unread_cols, column_names))
+    declared = column_dtypes(category)
+    dtypes = dict(zip(schema.translate(declared, column_names), declared.values()))
+    usecols = [name for name in names if name not in unread]
+    dtypes = {name: dtype for name, dtype in dtypes.items() if name in usecols}
+
+    def read(**kwargs):
+        return pd.read_csv(path, skiprows=HEADER_ROWS, header=None, names=names, usecols=usecols, **kwargs)
+
+    try:
+        return read(dtype=dtypes)
+    except ValueError as e:
+        if strict:
+            raise SchemaDriftError(f"{os.path.basename(path)}: {e}") from e
+        # e.g. a blank total in a count column; let pandas infer instead
+        print(f"⚠️ {os.path.basename(path)} does not fit the declared dtypes ({e}), inferring types")
+        return read()
+
+
+def _timed_read(path, column_names, category, strict, labels, cache=None):
+    with stage("read_file", file=os.path.basename(path), **labels) as read:
+        return read.output(read_raw_csv(path, column_names, category, strict, cache))
+
+
+def load_league_files(raw_data_dir, categories, max_workers=None, column_names="legacy", strict=False,
+                      cache=None):
+    """Read every squad and opponent file of a league concurrently
+
+    The C parser releases the GIL, so a thread pool lets slow reads (e.g. on
+    a network mount) overlap; ``max_workers=1`` reads in the calling thread
+    instead (e.g. so a profiler sees the reads). Returns a dict keyed by
+    (category name, is_opponent); the first read error is re-raised.
+    ``cache`` is an optional ParseCache (see read_raw_csv).
+    """
+    paths = raw_file_paths(raw_data_dir, categories)
+    categories_by_name = {category.name: category for category in categories}
+    max_workers = max_workers or min(len(paths), MAX_READ_THREADS)
+    # Reader threads do not see the caller's open stage, so hand its labels over
+    labels = current_labels()
+
+    if max_workers == 1:
+        return {
+            key: _timed_read(path, column_names, categories_by_name[key[0]], strict, labels, cache)
+            for key, path in paths.items()
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            key: executor.submit(_timed_read, path, column_names, categories_by_name[key[0]], strict, labels, cache)
+            for key, path in paths.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
@@ -0,0 +1,122 @@
+# football_data_warehouse/scripts/pipelines/process/manifest.py
+import hashlib
+import json
+import os
+
+MANIFEST_NAME = "pipeline_manifest.json"
+MANIFEST_VERSION = 2
+
+# Read size used when hashing files
+HASH_CHUNK_SIZE = 1 << 20
+
+
+def get_manifest_path(data_dir):
+    """Return the manifest location inside the data directory"""
+    return os.path.join(data_dir, MANIFEST_NAME)
+
+
+def load_manifest(path):
+    """Load the run manifest, or an empty one if none exists yet"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        manifest = {"version": MANIFEST_VERSION}
+    manifest.setdefault("leagues", {})
+    manifest.setdefault("combined", {})
+    return manifest
+
+
+def save_manifest(manifest, path):
+    """Atomically write the run manifest"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def manifest_key(league, season=None):
+    """Manifest entry name of a (league, season) build"""
+    return f"league={league}/season={season}" if season else league
+
+
+def hash_file(path):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_file(path, previous=None):
+    """Return {sha256, size, mtime_ns} for a file, or None if it is missing
+
+    If ``previous`` has the same size and mtime the stored hash is reused,
+    so unchanged files are not re-read.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime_ns") == stat.st_mtime_ns:
+        sha256 = previous["sha256"]
+    else:
+        sha256 = hash_file(path)
+    return {"sha256": sha256, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def fingerprint_files(paths, previous=None, root=None):
+    """Fingerprint files keyed by base name, reusing ``previous`` fingerprints
+
+    With ``root`` the keys are paths relative to it, for files that share a
+    base name (e.g. the table of every league=/season= partition).
+    """
+    previous = previous or {}
+    fingerprints = {}
+    for path in paths:
+        name = os.path.relpath(path, root).replace(os.sep, "/") if root else os.path.basename(path)
+        fingerprints[name] = fingerprint_file(path, previous.get(name))
+    return fingerprints
+
+
+def hash_payload(payload):
+    """Stable SHA-256 of a JSON-serialisable object"""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def changed_files(old, new):
+    """Names whose content hash differs (or that appeared/disappeared)"""
+    old = old or {}
+    names = sorted(set(old) | set(new))
+    return [
+        name for name in names
+        if (old.get(name) or {}).get("sha256") != (new.get(name) or {}).get("sha256")
+    ]
+
+
+def stale_reason(entry, inputs, spec_hash, output_path):
+    """Explain why an output must be rebuilt, or return None if it is current
+
+    The output must still hold what the recorded build wrote (its
+    ``output`` fingerprint), so a table rewritten by another run with
+    different options is rebuilt.
+    """
+    if not entry:
+        return "no previous build"
+    if entry.get("spec_hash") != spec_hash:
+        return "transform spec changed"
+    changed = changed_files(entry.get("inputs"), inputs)
+    if changed:
+        return f"inputs changed: {', '.join(changed)}"
+    output = fingerprint_file(output_path, entry.get("output"))
+    if output is None:
+        return "output missing"
+    if output["sha256"] != (entry.get("output") or {}).get("sha256"):
+        return "output changed since the last build"
+    return None
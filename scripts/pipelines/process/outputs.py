@@ -0,0 +1,177 @@
+# football_data_warehouse/scripts/pipelines/process/outputs.py
+import csv
+
+import numpy as np
+import pandas as pd
+
+from .formats import (  # noqa: F401  (re-exported)
+    COLUMNAR_FORMATS,
+    COMPACT_RTOL,
+    OUTPUT_FORMATS,
+    check_format,
+    format_from_path,
+    output_path,
+)
+
+# Key columns compact_frame stores as categoricals
+CATEGORY_COLUMNS = ("team", "Squad", "League", "Season")
+
+
+def cast_floats(df, float_dtype):
+    """Cast every float column of ``df`` to ``float_dtype``"""
+    float_cols = df.select_dtypes(include="floating").columns
+    if float_dtype is None or len(float_cols) == 0:
+        return df
+    return df.astype({col: np.dtype(float_dtype) for col in float_cols})
+
+
+def compact_frame(df, rtol=COMPACT_RTOL, verify=True):
+    """Memory-compact copy of ``df``
+
+    Float columns become float32, integer columns int32 where their range
+    fits, and the team/league/season keys categoricals. With ``verify``
+    a float column is only narrowed when every value survives the float32
+    round trip within ``rtol``; columns that do not stay float64 and are
+    reported. Without it every float column is cast.
+    """
+    dtypes = {}
+    float_cols = list(df.select_dtypes(include="floating").columns)
+    if float_cols:
+        values = df[float_cols].to_numpy(dtype=np.float64)
+        with np.errstate(over="ignore"):
+            narrowed = values.astype(np.float32)
+        if verify:
+            fits = np.isclose(narrowed.astype(np.float64), values, rtol=rtol, atol=0.0, equal_nan=True).all(axis=0)
+        else:
+            fits = np.ones(len(float_cols), dtype=bool)
+        kept = [col for col, ok in zip(float_cols, fits) if not ok]
+        if kept:
+            print(f"⚠️ Keeping {len(kept)} float64 columns outside the float32 tolerance: {', '.join(kept)}")
+        dtypes.update({col: "float32" for col, ok in zip(float_cols, fits) if ok})
+
+    int32 = np.iinfo(np.int32)
+    for col in df.select_dtypes(include="integer").columns:
+        if df[col].empty or (df[col].min() >= int32.min and df[col].max() <= int32.max):
+            dtypes[col] = "int32"
+
+    dtypes.update({col: "category" for col in CATEGORY_COLUMNS if col in df.columns})
+    return df.astype(dtypes)
+
+
+def write_table(df, path, fmt=None, float_dtype=None, compact=False):
+    """Write ``df`` as CSV, Parquet or Feather (Arrow IPC)
+
+    ``float_dtype`` (e.g. ``"float32"``) sets the stored type of float
+    columns in the columnar formats; CSV is always written as text.
+    ``compact`` stores the columnar formats with compact_frame's verified
+    float32, int32 and dictionary-encoded key columns.
+    """
+    fmt = fmt or format_from_path(path)
+    check_format(fmt)
+
+    if fmt != "csv":
+        df = compact_frame(df) if compact else cast_floats(df, float_dtype)
+    if fmt == "csv":
+        df.to_csv(path, index=False)
+    elif fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+    return path
+
+
+def read_table(path, columns=None, fmt=None, compact=False, rtol=COMPACT_RTOL, round_trip=False):
+    """Read a table written by ``write_table``, optionally only ``columns``
+
+    With ``compact`` the table is returned as compact_frame(``rtol``). With
+    ``round_trip`` CSV floats are parsed exactly, so writing the table
+    again reproduces the same text.
+    """
+    fmt = fmt or format_from_path(path)
+    check_format(fmt)
+
+    if fmt == "csv":
+        df = pd.read_csv(path, usecols=columns, float_precision="round_trip" if round_trip else None)
+    elif fmt == "parquet":
+        df = pd.read_parquet(path, columns=columns)
+    else:
+        df = pd.read_feather(path, columns=columns)
+    return compact_frame(df, rtol) if compact else df
+
+
+def read_columns(path, fmt=None):
+    """Column names of a stored table, read from its header or schema only"""
+    fmt = fmt or format_from_path(path)
+    check_format(fmt)
+
+    if fmt == "csv":
+        with open(path, encoding="utf-8", newline="") as f:
+            return next(csv.reader(f), [])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+        return pq.read_schema(path).names
+    import pyarrow.ipc as ipc
+    with ipc.open_file(path) as reader:
+        return reader.schema.names
+
+
+class TableAppender:
+    """Write a table block by block with a fixed schema
+
+    CSV blocks are appended to the file, Parquet blocks become row groups
+    and Feather blocks Arrow record batches, so only the current block is
+    held in memory. ``text_columns`` are stored as strings and every other
+    column as ``float_dtype``; blocks are aligned to ``columns``, with
+    missing columns left empty.
+    """
+
+    def __init__(self, path, fmt, columns, text_columns=(), float_dtype="float64"):
+        check_format(fmt)
+        self.path, self.fmt = path, fmt
+        self.columns = list(columns)
+        self.dtypes = {col: float_dtype or "float64" for col in self.columns if col not in text_columns}
+        self.rows = 0
+        self._writer = None
+        if fmt != "csv":
+            import pyarrow as pa
+            self._schema = pa.schema([
+                (col, pa.from_numpy_dtype(np.dtype(self.dtypes[col])) if col in self.dtypes else pa.string())
+                for col in self.columns
+            ])
+
+    def append(self, df):
+        """Align ``df`` to the schema and write it"""
+        block = df.reindex(columns=self.columns).astype(self.dtypes)
+        if self.fmt == "csv":
+            block.to_csv(self.path, mode="w" if self.rows == 0 else "a", header=self.rows == 0, index=False)
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(block, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._writer = self._open_writer()
+            self._writer.write_table(table)
+        self.rows += len(block)
+
+    def _open_writer(self):
+        if self.fmt == "parquet":
+            import pyarrow.parquet as pq
+            return pq.ParquetWriter(self.path, self._schema)
+        import pyarrow.ipc as ipc
+        return ipc.new_file(self.path, self._schema)
+
+    def close(self):
+        """Finish the file (an empty table still gets its header or schema)"""
+        if self.rows == 0:
+            if self.fmt == "csv":
+                pd.DataFrame(columns=self.columns).to_csv(self.path, index=False)
+            else:
+                self._writer = self._open_writer()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
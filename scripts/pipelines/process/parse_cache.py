@@ -0,0 +1,179 @@
+# football_data_warehouse/scripts/pipelines/process/parse_cache.py
+import os
+import threading
+
+# pandas is imported where a frame is read, so the pipeline's command line
+# can import this module without it (see pipeline.py)
+from .manifest import hash_file, hash_payload
+
+# Bump when a change to the raw readers alters the frames they return
+PARSE_CACHE_VERSION = 1
+
+# Where sidecars go when no explicit directory is given
+CACHE_DIR_NAME = "parse_cache"
+
+# Default size budget of the cache directory
+DEFAULT_CACHE_MB = 256
+
+SIDECAR_EXTENSION = ".feather"
+
+
+def default_cache_dir(data_dir):
+    """``data/parse_cache/``"""
+    return os.path.join(data_dir, CACHE_DIR_NAME)
+
+
+class ParseCache:
+    """Parsed raw CSVs stored as Feather sidecars, keyed by file content
+
+    A sidecar's key hashes the raw file's bytes together with the parse
+    options, so an edited file or a different reader never hits a stale
+    frame. Reading a hit refreshes the sidecar's mtime; once the directory
+    grows past ``max_mb`` the least recently used sidecars are deleted.
+    Sidecars are written atomically, so several processes can share one
+    directory.
+    """
+
+    def __init__(self, directory, max_mb=DEFAULT_CACHE_MB):
+        self.directory = directory
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Locks cannot be pickled into pool workers
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def key(self, path, options=None):
+        """Cache key of ``path`` parsed with ``options``"""
+        import pandas as pd
+
+        return hash_payload({
+            "sha256": hash_file(path),
+            "options": options or {},
+            "pandas": pd.__version__,
+            "version": PARSE_CACHE_VERSION,
+        })
+
+    def sidecar_path(self, key):
+        return os.path.join(self.directory, f"{key}{SIDECAR_EXTENSION}")
+
+    def get(self, key):
+        """The cached frame for ``key``, or None"""
+        import pandas as pd
+
+        path = self.sidecar_path(key)
+        try:
+            df = pd.read_feather(path)
+            os.utime(path)
+        except (OSError, ValueError):
+            # Missing, or half-written by a process that crashed
+            return None
+        return df
+
+    def put(self, key, df):
+        """Store ``df`` under ``key`` and evict down to the size budget
+
+        Frames Feather cannot hold (e.g. a non-default index) are not cached.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.sidecar_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            df.to_feather(tmp_path)
+            os.replace(tmp_path, path)
+        except (ValueError, TypeError) as e:
+            print(f"⚠️ Not caching a parsed frame: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.evict()
+
+    def load(self, path, parse, options=None):
+        """Return ``parse()`` for ``path``, from its sidecar when one exists"""
+        key = self.key(path, options)
+        df = self.get(key)
+        with self._lock:
+            if df is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if df is None:
+            df = parse()
+            self.put(key, df)
+        return df
+
+    def read_csv(self, path, **kwargs):
+        """Cached ``pd.read_csv(path, **kwargs)``"""
+        import pandas as pd
+
+        return self.load(path, lambda: pd.read_csv(path, **kwargs), {"reader": "read_csv", "kwargs": kwargs})
+
+    def sidecars(self):
+        """(mtime, bytes, path) of every sidecar, least recently used first"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(SIDECAR_EXTENSION):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return sorted(entries)
+
+    def size(self):
+        """Bytes used by the sidecars"""
+        return sum(size for _, size, _ in self.sidecars())
+
+    def evict(self):
+        """Delete least recently used sidecars until the cache fits ``max_bytes``"""
+        entries = self.sidecars()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process evicted it first
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Delete every sidecar"""
+        for _, _, path in self.sidecars():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def summary(self):
+        """One-line hit/miss and size report"""
+        return (
+            f"🗄️ Parse cache: {self.hits} hits, {self.misses} misses, "
+            f"{self.size() / (1024 * 1024):.1f}/{self.max_bytes / (1024 * 1024):g} MiB in {self.directory}"
+        )
+
+
+def open_cache(directory, max_mb=DEFAULT_CACHE_MB):
+    """A ParseCache trimmed to its budget, or None (with a warning) when pyarrow is missing"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("⚠️ The parse cache stores Feather files and needs pyarrow (pip install pyarrow), parsing CSVs instead")
+        return None
+    cache = ParseCache(directory, max_mb)
+    cache.evict()
+    return cache
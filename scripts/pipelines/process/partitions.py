@@ -0,0 +1,79 @@
+# football_data_warehouse/scripts/pipelines/process/partitions.py
+import os
+
+from .formats import OUTPUT_FORMATS, output_path
+
+# Storage layouts for processed league tables: one file per league, or
+# hive-style league=<League>/season=<Season>/ partitions
+LAYOUTS = ("flat", "partitioned")
+
+# Season label of a league's unpartitioned raw snapshot (Raw_data/<League>_data/*.csv)
+DEFAULT_SEASON = "current"
+
+# File name (without extension) of the table inside each partition
+PARTITION_STEM = "squad_stats"
+
+
+def check_layout(layout):
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{layout}', expected one of {LAYOUTS}")
+
+
+def partition_dir(root, league, season):
+    """Return ``root/league=<league>/season=<season>``"""
+    return os.path.join(root, f"league={league}", f"season={season}")
+
+
+def partition_path(root, league, season, fmt="csv"):
+    """Return the table file of one league/season partition"""
+    return output_path(partition_dir(root, league, season), PARTITION_STEM, fmt)
+
+
+def partition_key(path, root):
+    """Partition path relative to ``root`` (e.g. ``league=La_Liga/season=current``)"""
+    return os.path.relpath(os.path.dirname(path), root).replace(os.sep, "/")
+
+
+def _partition_values(directory, name, wanted=None):
+    """Sorted ``name=<value>`` sub-directories of ``directory``, limited to ``wanted``"""
+    if not os.path.isdir(directory):
+        return []
+    prefix = f"{name}="
+    values = [
+        entry.name[len(prefix):] for entry in os.scandir(directory)
+        if entry.is_dir() and entry.name.startswith(prefix)
+    ]
+    return sorted(value for value in values if wanted is None or value in wanted)
+
+
+def find_partitions(root, fmt="csv", leagues=None, seasons=None):
+    """List the stored partitions as (league, season, path), sorted
+
+    ``leagues``/``seasons`` prune by directory name, so partitions outside
+    them are never listed, let alone read.
+    """
+    partitions = []
+    for league in _partition_values(root, "league", leagues):
+        league_dir = os.path.join(root, f"league={league}")
+        for season in _partition_values(league_dir, "season", seasons):
+            path = os.path.join(league_dir, f"season={season}", f"{PARTITION_STEM}{OUTPUT_FORMATS[fmt]}")
+            if os.path.exists(path):
+                partitions.append((league, season, path))
+    return partitions
+
+
+def read_partitions(root, fmt="csv", leagues=None, seasons=None, columns=None, skip=(), round_trip=False):
+    """Read the matching partitions into a {(league, season): DataFrame} dict
+
+    The league and season come from the partition path, not the file.
+    Partitions whose (league, season) is in ``skip`` are not read;
+    ``round_trip`` is passed to read_table.
+    """
+    # Imported here so the path helpers above stay free of pandas
+    from .outputs import read_table
+
+    return {
+        (league, season): read_table(path, columns=columns, fmt=fmt, round_trip=round_trip)
+        for league, season, path in find_partitions(root, fmt, leagues, seasons)
+        if (league, season) not in skip
+    }
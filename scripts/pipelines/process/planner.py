@@ -0,0 +1,202 @@
+# football_data_warehouse/scripts/pipelines/process/planner.py
+import os
+from collections import Counter
+
+# Standard library only: a plan is built from directory listings, file
+# stats and the cached two-row header schemas, never from DataFrames.
+from .manifest import changed_files, fingerprint_files, manifest_key, stale_reason
+from .schema import get_schema
+from .specs import (
+    COLUMNS_TO_DROP,
+    STAT_CATEGORIES,
+    job_label,
+    processed_path_for,
+    raw_data_dir_for,
+    raw_file_paths,
+    resolve_category,
+)
+
+
+def file_columns(schema, category, column_names="legacy", is_opponent=False):
+    """Columns process_stats produces for one raw file, read from its header
+
+    Mirrors the engine: unused columns are skipped at read time, dropped
+    and divided columns removed, ``<col>_per_90`` columns appended and, for
+    opponent tables, ``_against`` added to everything but Squad.
+    """
+    unread = set(schema.translate(category.unread_cols, column_names))
+    resolved = resolve_category(category, schema, column_names)
+    removed = set(resolved.drop_cols + resolved.divide_cols)
+    columns = [
+        col for col in schema.names(column_names) if col not in unread and col not in removed
+    ] + [f"{col}_per_90" for col in resolved.divide_cols]
+    if is_opponent:
+        columns = [col if col == 'Squad' else f"{col}_against" for col in columns]
+    return columns
+
+
+def category_columns(squad_schema, opponent_schema, category, column_names="legacy"):
+    """Columns of a category's merged squad/opponent table"""
+    squad = file_columns(squad_schema, category, column_names)
+    opponent = file_columns(opponent_schema, category, column_names, is_opponent=True)
+    columns = [col for col in squad + [col for col in opponent if col != 'Squad'] if col not in COLUMNS_TO_DROP]
+    return [col if col == 'Squad' else category.prefix + col for col in columns]
+
+
+def expected_columns(paths, categories=STAT_CATEGORIES, column_names="legacy"):
+    """Output columns of a league table, or None when a raw file is missing
+
+    ``paths`` maps (category name, is_opponent) to a raw file, as returned
+    by raw_file_paths.
+    """
+    if not all(os.path.exists(path) for path in paths.values()):
+        return None
+    columns = []
+    for category in categories:
+        merged = category_columns(
+            get_schema(paths[(category.name, False)]),
+            get_schema(paths[(category.name, True)]),
+            category,
+            column_names,
+        )
+        columns += merged if not columns else [col for col in merged if col != 'Squad']
+    return columns
+
+
+def combined_columns(league_columns, layout="flat"):
+    """Columns of the combined dataset built from these league tables"""
+    columns = ["League", "Season"] if layout == "partitioned" else []
+    for cols in league_columns:
+        columns += [col for col in cols if col not in columns]
+    return ['team' if col == 'Squad' else col for col in columns]
+
+
+def plan_league(league, season, data_dir, manifest, spec_hash, output_format="csv", layout="flat",
+                column_names="legacy", incremental=False, categories=STAT_CATEGORIES):
+    """Describe what a run would do for one (league, season) without reading its data
+
+    Lists the raw files of ``categories`` with their state ("ok",
+    "missing", or with ``incremental`` "stale" when its content changed
+    since the last incremental build), whether the league would be rebuilt
+    and why, and the columns its table would have. Raw files are only
+    hashed for an incremental plan of a league with a manifest entry.
+    """
+    raw_data_dir = raw_data_dir_for(league, data_dir, season)
+    paths = raw_file_paths(raw_data_dir, categories)
+    entry = manifest["leagues"].get(manifest_key(league, season))
+    inputs, stale = {}, set()
+    if incremental and entry:
+        # Only an incremental plan compares contents (hashes are reused while size and mtime match)
+        present = [path for path in paths.values() if os.path.exists(path)]
+        inputs = fingerprint_files(present, entry.get("inputs"))
+        stale = set(changed_files(entry.get("inputs"), inputs))
+
+    files = []
+    for path in paths.values():
+        name = os.path.basename(path)
+        state = "missing" if not os.path.exists(path) else "stale" if name in stale else "ok"
+        files.append({"file": name, "path": path, "state": state})
+
+    output = processed_path_for(league, data_dir, output_format, season, layout)
+    missing = [f["file"] for f in files if f["state"] == "missing"]
+    partial = set(categories) != set(STAT_CATEGORIES)
+    blocked = True
+    if missing:
+        reason = f"missing raw files: {', '.join(missing)}"
+    elif partial and not os.path.exists(output):
+        reason = "no existing table to splice the categories into"
+    else:
+        blocked = False
+        if incremental:
+            reason = stale_reason(entry, inputs, spec_hash, output)
+        elif partial:
+            reason = f"splice {', '.join(category.name for category in categories)}"
+        else:
+            reason = "full run"
+    return {
+        "league": league,
+        "season": season,
+        "files": files,
+        "rebuild": reason is not None and not blocked,
+        "reason": reason,
+        "output": output,
+        # A partial rebuild is spliced into the full table, so its columns are unchanged
+        "columns": expected_columns(raw_file_paths(raw_data_dir, STAT_CATEGORIES), STAT_CATEGORIES, column_names),
+    }
+
+
+def build_plan(jobs, data_dir, manifest, spec_hash, output_format="csv", layout="flat", column_names="legacy",
+               incremental=False, categories=STAT_CATEGORIES):
+    """Plan every (league, season) job plus the combined dataset they make"""
+    leagues = [
+        plan_league(
+            league, season, data_dir, manifest, spec_hash, output_format, layout, column_names, incremental,
+            categories,
+        )
+        for league, season in jobs
+    ]
+    return {
+        "incremental": incremental,
+        "leagues": leagues,
+        "rebuild": [manifest_key(league["league"], league["season"]) for league in leagues if league["rebuild"]],
+        "combined_columns": combined_columns(
+            [league["columns"] for league in leagues if league["columns"] is not None], layout
+        ),
+    }
+
+
+def category_counts(columns, categories=STAT_CATEGORIES):
+    """Summarise output columns as ``Squad + <category> <count>, ...``"""
+    counts = Counter(
+        next((category.name for category in categories if col.startswith(category.prefix)), "other")
+        for col in columns if col != 'Squad'
+    )
+    names = [category.name for category in categories] + ["other"]
+    summary = ", ".join(f"{name} {counts[name]}" for name in names if counts[name])
+    return f"Squad + {summary}" if 'Squad' in columns else summary
+
+
+def print_plan(plan, verbose=False):
+    """Print a plan built by plan_league for every job
+
+    Columns are summarised per category unless ``verbose``.
+    """
+    leagues = plan["leagues"]
+    known = [tuple(league["columns"]) for league in leagues if league["columns"] is not None]
+    common = Counter(known).most_common(1)[0][0] if known else ()
+
+    print("=" * 60)
+    print("🗺️ RUN PLAN (dry run, no data is loaded or written)")
+    print("=" * 60)
+    for league in leagues:
+        label = job_label(league["league"], league["season"])
+        if league["rebuild"]:
+            print(f"🔁 {label}: rebuild ({league['reason']})")
+        elif league["reason"]:
+            print(f"❌ {label}: cannot build ({league['reason']})")
+        else:
+            print(f"⏭️ {label}: up to date")
+        read = [f for f in league["files"] if f["state"] != "missing"]
+        stale = [f["file"] for f in league["files"] if f["state"] == "stale"]
+        print(f"   📄 {len(read)} raw files in {os.path.dirname(league['files'][0]['path'])}"
+              + (f", stale: {', '.join(stale)}" if stale else ""))
+        columns = league["columns"]
+        if columns is not None:
+            notes = ""
+            if tuple(columns) != common:
+                absent = [col for col in common if col not in columns]
+                extra = [col for col in columns if col not in common]
+                notes = "".join([
+                    f", without {', '.join(absent) if verbose else category_counts(absent)}" if absent else "",
+                    f", adding {', '.join(extra) if verbose else category_counts(extra)}" if extra else "",
+                ])
+            print(f"   📐 {len(columns)} columns → {league['output']}{notes}")
+
+    print("-" * 60)
+    rebuild = [league for league in leagues if league["rebuild"]]
+    print(f"📋 {len(rebuild)} of {len(leagues)} league tables would be rebuilt")
+    if common:
+        listed = ", ".join(common) if verbose else category_counts(common)
+        print(f"📐 League table columns ({len(common)}): {listed}")
+    if plan["combined_columns"]:
+        print(f"📐 Combined dataset: {len(plan['combined_columns'])} columns")
@@ -0,0 +1,41 @@
+# football_data_warehouse/scripts/pipelines/process/profiling.py
+import cProfile
+import io
+import os
+import pstats
+import time
+
+# Where profiles go when no explicit directory is given
+PROFILES_DIR_NAME = "profiles"
+
+# Orderings offered for the hot-function summary
+PROFILE_SORTS = ("tottime", "cumulative", "ncalls")
+
+
+def default_profile_dir(data_dir):
+    """``data/profiles/<timestamp>/``"""
+    return os.path.join(data_dir, PROFILES_DIR_NAME, time.strftime("%Y%m%d-%H%M%S"))
+
+
+def profile_call(path, func, *args, **kwargs):
+    """Run ``func`` under cProfile, dump the stats to ``path`` and return its result
+
+    The stats are written even when ``func`` raises.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        profiler.dump_stats(path)
+
+
+def summarise_profiles(paths, top=25, sort="tottime"):
+    """Text table of the ``top`` hottest functions across several .pstats files"""
+    paths = [path for path in paths if os.path.exists(path)]
+    if not paths:
+        return ""
+    stream = io.StringIO()
+    stats = pstats.Stats(*paths, stream=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+    return stream.getvalue()
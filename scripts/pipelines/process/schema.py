@@ -0,0 +1,131 @@
+# football_data_warehouse/scripts/pipelines/process/schema.py
+import csv
+import io
+import os
+import threading
+from dataclasses import dataclass
+
+# Column naming styles for raw FBref tables
+COLUMN_NAME_STYLES = ("legacy", "qualified")
+
+# Rows taken by the two-level FBref header
+HEADER_ROWS = 2
+
+
+@dataclass(frozen=True)
+class HeaderSchema:
+    """Column names derived from a raw file's two-row header"""
+    header_text: str
+    groups: tuple
+    leaves: tuple
+    qualified: tuple
+    legacy: tuple
+
+    def names(self, style="legacy"):
+        """Column names for ``style`` ("legacy" or "qualified")"""
+        if style not in COLUMN_NAME_STYLES:
+            raise ValueError(f"Unknown column name style '{style}', expected one of {COLUMN_NAME_STYLES}")
+        return self.qualified if style == "qualified" else self.legacy
+
+    def translate(self, columns, style="legacy"):
+        """Map qualified column names to the names used by ``style``
+
+        Names not in the header are returned unchanged.
+        """
+        if style == "qualified":
+            return tuple(columns)
+        to_legacy = dict(zip(self.qualified, self.legacy))
+        return tuple(to_legacy.get(col, col) for col in columns)
+
+
+def is_unnamed_group(group):
+    """True for the placeholder pandas writes over ungrouped columns"""
+    return not group or group.startswith("Unnamed:")
+
+
+def qualified_names(groups, leaves):
+    """Leaf names, with the group appended to leaves that occur more than once
+
+    e.g. the two ``Gls`` columns of the standard table become
+    ``Gls (Performance)`` and ``Gls (Per 90 Minutes)``; unique leaves keep
+    their plain name. Names do not depend on column position.
+    """
+    counts = {}
+    for leaf in leaves:
+        counts[leaf] = counts.get(leaf, 0) + 1
+
+    names = []
+    for group, leaf in zip(groups, leaves):
+        if counts[leaf] > 1 and not is_unnamed_group(group):
+            names.append(f"{leaf} ({group})")
+        else:
+            names.append(leaf)
+    return tuple(names)
+
+
+def legacy_names(leaves):
+    """Leaf names de-duplicated the way pandas does (``Gls``, ``Gls.1``, ...)"""
+    seen = {}
+    names = []
+    for leaf in leaves:
+        count = seen.get(leaf, 0)
+        names.append(leaf if count == 0 else f"{leaf}.{count}")
+        seen[leaf] = count + 1
+    return tuple(names)
+
+
+def build_schema(header_text):
+    """Build a HeaderSchema from the raw text of the two header rows"""
+    rows = list(csv.reader(io.StringIO(header_text)))
+    if len(rows) < HEADER_ROWS:
+        raise ValueError("Expected a two-row FBref header")
+    groups, leaves = rows[0], rows[1]
+    if len(groups) != len(leaves):
+        raise ValueError(f"Header rows differ in length ({len(groups)} groups, {len(leaves)} columns)")
+
+    return HeaderSchema(
+        header_text=header_text,
+        groups=tuple("" if is_unnamed_group(group) else group for group in groups),
+        leaves=tuple(leaves),
+        qualified=qualified_names(groups, leaves),
+        legacy=legacy_names(leaves),
+    )
+
+
+def read_header_text(path):
+    """Return the first two lines of a raw file"""
+    with open(path, encoding="utf-8", newline="") as f:
+        return "".join(f.readline() for _ in range(HEADER_ROWS))
+
+
+# Parsed schemas keyed by header text. Every league's copy of a category file
+# shares one header, so after the first league each lookup skips parsing.
+_SCHEMA_CACHE = {}
+# (path, size, mtime) -> schema, so repeat lookups of a file skip reading it
+_PATH_CACHE = {}
+_SCHEMA_LOCK = threading.Lock()
+
+
+def get_schema(path):
+    """Return the (cached) HeaderSchema of a raw FBref file"""
+    stat = os.stat(path)
+    path_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    schema = _PATH_CACHE.get(path_key)
+    if schema is not None:
+        return schema
+
+    header_text = read_header_text(path)
+    schema = _SCHEMA_CACHE.get(header_text)
+    if schema is None:
+        schema = build_schema(header_text)
+    with _SCHEMA_LOCK:
+        schema = _SCHEMA_CACHE.setdefault(header_text, schema)
+        _PATH_CACHE[path_key] = schema
+    return schema
+
+
+def clear_schema_cache():
+    """Forget every cached header schema"""
+    with _SCHEMA_LOCK:
+        _SCHEMA_CACHE.clear()
+        _PATH_CACHE.clear()
@@ -0,0 +1,311 @@
+# football_data_warehouse/scripts/pipelines/process/specs.py
+import os
+from dataclasses import asdict, dataclass, replace
+
+# Only the standard library here: the league registry, category specs and
+# file locations must be importable without pandas for the fast CLI paths.
+from .formats import output_path as table_path
+from .manifest import hash_file, hash_payload
+from .partitions import DEFAULT_SEASON, check_layout, partition_path
+from .schema import get_schema
+
+
+@dataclass(frozen=True)
+class StatCategory:
+    """Processing spec for one FBref squad stat category"""
+    name: str
+    file_stem: str
+    prefix: str
+    base_col: str
+    drop_cols: tuple
+    divide_cols: tuple
+    keep_cols: tuple = ()
+
+    @property
+    def columns(self):
+        """Every raw column this category declares, in qualified names"""
+        declared = ('Squad', self.base_col) + self.drop_cols + self.divide_cols + self.keep_cols
+        return tuple(dict.fromkeys(declared))
+
+    @property
+    def unread_cols(self):
+        """Dropped columns the transform never uses, so they need not be parsed"""
+        return tuple(
+            col for col in self.drop_cols
+            if col not in self.divide_cols and col != self.base_col
+        )
+
+    @property
+    def filename(self):
+        return f"{self.file_stem}.csv"
+
+    @property
+    def opponent_filename(self):
+        return f"{self.file_stem}(opponent stats).csv"
+
+
+# Stat categories in the order they are merged into the final league table.
+# Columns use the group-qualified names from process.schema, e.g.
+# 'Gls (Performance)' rather than pandas' position-dependent 'Gls'/'Gls.1'.
+# keep_cols are the rate columns passed through unchanged; together the four
+# column lists describe the whole raw file (see loader.check_columns).
+STAT_CATEGORIES = (
+    StatCategory(
+        name="standard",
+        file_stem="Squad_Standard_Stats",
+        prefix="Standard_",
+        base_col='MP',
+        drop_cols=('# Pl', 'Age', 'Starts', 'Min', '90s', 'Gls (Performance)', 'Ast (Performance)',
+                   'G+A (Performance)', 'G-PK (Performance)'),
+        divide_cols=('PK', 'PKatt', 'CrdY', 'CrdR', 'PrgC', 'PrgP'),
+        keep_cols=('Poss', 'xG (Expected)', 'npxG (Expected)', 'xAG (Expected)', 'npxG+xAG (Expected)',
+                   'Gls (Per 90 Minutes)', 'Ast (Per 90 Minutes)', 'G+A (Per 90 Minutes)',
+                   'G-PK (Per 90 Minutes)', 'G+A-PK', 'xG (Per 90 Minutes)', 'xAG (Per 90 Minutes)',
+                   'xG+xAG', 'npxG (Per 90 Minutes)', 'npxG+xAG (Per 90 Minutes)'),
+    ),
+    StatCategory(
+        name="goalkeeping",
+        file_stem="Squad_Goalkeeping_Stats",
+        prefix="Goalkeeping_",
+        base_col='MP',
+        drop_cols=('# Pl', 'Starts', 'Min', '90s', 'GA', 'CS'),
+        divide_cols=('SoTA', 'Saves', 'W', 'D', 'L', 'PKatt', 'PKA', 'PKsv', 'PKm'),
+        keep_cols=('GA90', 'Save% (Performance)', 'CS%', 'Save% (Penalty Kicks)'),
+    ),
+    StatCategory(
+        name="advanced_goalkeeping",
+        file_stem="Squad_Advanced_Goalkeeping_Stats",
+        prefix="AdvGoalkeeping_",
+        base_col='90s',
+        drop_cols=('# Pl', 'GA', 'PKA', '#OPA'),
+        divide_cols=('FK', 'CK', 'OG', 'Cmp', 'Att (Launched)', 'Cmp%', 'Att (GK)', 'Thr', 'Att (Goal Kicks)',
+                     'Opp', 'Stp'),
+        keep_cols=('PSxG', 'PSxG/SoT', 'PSxG+/-', '/90', 'Launch% (Passes)', 'AvgLen (Passes)',
+                   'Launch% (Goal Kicks)', 'AvgLen (Goal Kicks)', 'Stp%', '#OPA/90', 'AvgDist'),
+    ),
+    StatCategory(
+        name="shooting",
+        file_stem="Squad_Shooting_Stats",
+        prefix="Shooting_",
+        base_col='90s',
+        drop_cols=('# Pl', 'Sh', 'SoT', 'FK', 'PK', 'PKatt', 'xG', 'npxG'),
+        divide_cols=('Gls',),
+        keep_cols=('SoT%', 'Sh/90', 'SoT/90', 'G/Sh', 'G/SoT', 'Dist', 'npxG/Sh', 'G-xG', 'np:G-xG'),
+    ),
+    StatCategory(
+        name="passing",
+        file_stem="Squad_Passing_Stats",
+        prefix="Passing_",
+        base_col='90s',
+        drop_cols=('# Pl', 'Cmp (Total)', 'Att (Total)', 'Cmp% (Total)',
+                   'Cmp (Short)', 'Att (Short)', 'Cmp% (Short)',
+                   'Cmp (Medium)', 'Att (Medium)', 'Cmp% (Medium)',
+                   'Cmp (Long)', 'Att (Long)', 'Cmp% (Long)',
+                   'Ast', 'xAG', 'xA', 'A-xAG', 'PrgP'),
+        divide_cols=('TotDist', 'PrgDist', 'KP', '1/3', 'PPA', 'CrsPA'),
+    ),
+    StatCategory(
+        name="pass_types",
+        file_stem="Squad_Pass_Types_Stats",
+        prefix="PassTypes_",
+        base_col='90s',
+        drop_cols=('# Pl', 'Att'),
+        divide_cols=('Live', 'Dead', 'FK', 'TB', 'Sw', 'Crs', 'TI', 'CK',
+                     'In', 'Out', 'Str', 'Cmp', 'Off', 'Blocks'),
+    ),
+    StatCategory(
+        name="gsc",
+        file_stem="Squad_Goal_Shot_Creation_Stats",
+        prefix="GSC_",
+        base_col='90s',
+        drop_cols=('# Pl', 'SCA', 'GCA'),
+        divide_cols=('PassLive (SCA Types)', 'PassDead (SCA Types)', 'TO (SCA Types)',
+                     'Sh (SCA Types)', 'Fld (SCA Types)', 'Def (SCA Types)',
+                     'PassLive (GCA Types)', 'PassDead (GCA Types)', 'TO (GCA Types)',
+                     'Sh (GCA Types)', 'Fld (GCA Types)', 'Def (GCA Types)'),
+        keep_cols=('SCA90', 'GCA90'),
+    ),
+    StatCategory(
+        name="defensive",
+        file_stem="Squad_Defensive_Actions_Stats",
+        prefix="Defense_",
+        base_col='90s',
+        drop_cols=('# Pl',),
+        divide_cols=('Tkl (Tackles)', 'TklW', 'Def 3rd', 'Mid 3rd', 'Att 3rd', 'Tkl (Challenges)',
+                     'Att', 'Tkl%', 'Lost', 'Blocks', 'Sh', 'Pass', 'Int',
+                     'Tkl+Int', 'Clr', 'Err'),
+    ),
+    StatCategory(
+        name="possession",
+        file_stem="Squad_Possession_Stats",
+        prefix="Possession_",
+        base_col='90s',
+        drop_cols=('# Pl', 'Live', 'Poss', 'Touches', 'Def Pen', 'Def 3rd', 'Carries', 'TotDist'),
+        divide_cols=('Mid 3rd', 'Att 3rd', 'Att Pen', 'Att', 'Succ', 'Tkld', 'Carries',
+                     'TotDist', 'PrgDist', 'PrgC', '1/3', 'CPA', 'Mis', 'Dis', 'Rec', 'PrgR'),
+        keep_cols=('Succ%', 'Tkld%'),
+    ),
+    StatCategory(
+        name="misc",
+        file_stem="Squad_Miscellaneous_Stats",
+        prefix="Miscellaneous_",
+        base_col='90s',
+        drop_cols=('# Pl', 'CrdY', 'CrdR', '2CrdY', 'Crs', 'Int', 'Recov', 'Lost', 'OG', 'TklW', 'PKwon', 'PKcon'),
+        divide_cols=('Fls', 'Fld', 'Off', 'Crs', 'Int', 'OG', 'Recov', 'Won'),
+        keep_cols=('Won%',),
+    ),
+)
+
+# League folder prefix -> display name, in pipeline run order
+LEAGUES = {
+    "Brazil_Serie_A": "Brazil Serie A",
+    "Eredivisie": "Eredivisie",
+    "La_Liga": "La Liga",
+    "Bundesliga": "Bundesliga",
+    "Championship": "Championship",
+    "Premier_League": "Premier League",
+    "Ligue_1": "Ligue 1",
+    "Primeira_Liga": "Primeira Liga",
+    "Serie_A": "Serie A",
+    "Serie_B": "Serie B",
+}
+
+# Playing-time base columns removed before the final merge
+COLUMNS_TO_DROP = ['MP', 'MP_against', '90s', '90s_against']
+
+
+def get_data_dir():
+    """Return the project's data directory (three levels up from this script)"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.abspath(os.path.join(script_dir, os.pardir, os.pardir, os.pardir))
+    return os.path.join(project_root, "data")
+
+
+def raw_data_dir_for(league, data_dir=None, season=None):
+    """Return a league's raw data folder, or the folder of one of its seasons
+
+    Seasons live in sub-folders (``<League>_data/<season>/``); the files
+    directly in the league folder are the DEFAULT_SEASON snapshot.
+    """
+    league_dir = os.path.join(data_dir or get_data_dir(), "Raw_data", f"{league}_data")
+    if season is None or season == DEFAULT_SEASON:
+        return league_dir
+    return os.path.join(league_dir, season)
+
+
+def _has_csv_files(directory):
+    return any(entry.is_file() and entry.name.endswith(".csv") for entry in os.scandir(directory))
+
+
+def league_seasons(league, data_dir=None):
+    """List the seasons with raw files for a league, oldest first
+
+    Season sub-folders sort by name; the unpartitioned snapshot, if any,
+    comes last as DEFAULT_SEASON.
+    """
+    league_dir = raw_data_dir_for(league, data_dir)
+    if not os.path.isdir(league_dir):
+        return []
+    seasons = sorted(
+        entry.name for entry in os.scandir(league_dir)
+        if entry.is_dir() and not entry.name.startswith(".") and _has_csv_files(entry.path)
+    )
+    if _has_csv_files(league_dir):
+        seasons.append(DEFAULT_SEASON)
+    return seasons
+
+
+def job_label(league, season=None):
+    """Display name of a (league, season) build"""
+    return f"{league} {season}" if season else league
+
+
+def league_jobs(leagues, layout="flat", data_dir=None):
+    """Expand leagues into (league, season) builds
+
+    The flat layout builds each league's unpartitioned snapshot (season
+    None); the partitioned layout builds every season found in Raw_data.
+    """
+    if layout == "flat":
+        return [(league, None) for league in leagues]
+    return [(league, season) for league in leagues for season in league_seasons(league, data_dir)]
+
+
+def processed_path_for(league, data_dir=None, output_format="csv", season=None, layout="flat"):
+    """Return where a league's merged table is written
+
+    The flat layout keeps one ``<League>_merged_squad_stats`` file per
+    league and so only holds the DEFAULT_SEASON; the partitioned layout
+    writes ``league=<League>/season=<season>/squad_stats``.
+    """
+    check_layout(layout)
+    processed_dir = os.path.join(data_dir or get_data_dir(), "Processed_data")
+    if layout == "partitioned":
+        return partition_path(processed_dir, league, season or DEFAULT_SEASON, output_format)
+    if season not in (None, DEFAULT_SEASON):
+        raise ValueError(f"The flat layout only holds the {DEFAULT_SEASON} season, use the partitioned layout for {season}")
+    return table_path(processed_dir, f"{league}_merged_squad_stats", output_format)
+
+
+def raw_file_paths(raw_data_dir, categories):
+    """Map (category name, is_opponent) to the raw file path for a league"""
+    return {
+        (category.name, is_opponent): os.path.join(
+            raw_data_dir,
+            category.opponent_filename if is_opponent else category.filename
+        )
+        for category in categories
+        for is_opponent in (False, True)
+    }
+
+
+def league_input_paths(league, data_dir=None, categories=STAT_CATEGORIES, season=None):
+    """List every raw file a league (season) build reads"""
+    return list(raw_file_paths(raw_data_dir_for(league, data_dir, season), categories).values())
+
+
+def transform_spec_hash(categories=STAT_CATEGORIES, **options):
+    """Hash of everything that determines a league's output besides its raw files
+
+    Covers the category specs, the engine source and output options, so a
+    change to any of them invalidates previously built leagues.
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    return hash_payload({
+        "categories": [asdict(category) for category in categories],
+        "columns_to_drop": COLUMNS_TO_DROP,
+        "source": {
+            name: hash_file(os.path.join(package_dir, name))
+            for name in (
+                "formats.py", "league_engine.py", "loader.py", "outputs.py", "partitions.py", "schema.py",
+                "specs.py",
+            )
+        },
+        "options": options,
+    })
+
+
+def resolve_category(category, schema, column_names="legacy"):
+    """Express a category spec in the column names used to read one raw file"""
+    return replace(
+        category,
+        base_col=schema.translate([category.base_col], column_names)[0],
+        drop_cols=schema.translate(category.drop_cols, column_names),
+        divide_cols=schema.translate(category.divide_cols, column_names),
+        keep_cols=schema.translate(category.keep_cols, column_names),
+    )
+
+
+def resolve_league_categories(paths, categories, column_names="legacy"):
+    """Resolve each category spec against the header of every raw file
+
+    ``paths`` maps (category name, is_opponent) to a raw file, as returned
+    by raw_file_paths; the result uses the same keys.
+    """
+    return {
+        (category.name, is_opponent): resolve_category(
+            category, get_schema(paths[(category.name, is_opponent)]), column_names
+        )
+        for category in categories
+        for is_opponent in (False, True)
+    }
@@ -0,0 +1,143 @@
+# football_data_warehouse/scripts/pipelines/process/warehouse.py
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from .instrument import stage
+from .partitions import DEFAULT_SEASON
+from .specs import get_data_dir
+
+WAREHOUSE_NAME = "football_warehouse.sqlite"
+TABLE_NAME = "squad_stats"
+
+# Primary key of the stats table; league lookups use its leading column
+KEY_COLUMNS = ("league", "season", "team")
+
+# Hash of a row's values, compared on upsert so unchanged rows are not rewritten
+HASH_COLUMN = "row_hash"
+
+
+def get_warehouse_path(data_dir):
+    """Return the warehouse database location inside the data directory"""
+    return os.path.join(data_dir, WAREHOUSE_NAME)
+
+
+def quote(name):
+    """Quote a column name as an SQLite identifier"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def sql_type(dtype):
+    """SQLite column type for a pandas dtype"""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def connect(path):
+    """Open (creating if needed) the warehouse database"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    return sqlite3.connect(path)
+
+
+def ensure_table(conn, stats):
+    """Create the stats table and its indexes, adding columns new in ``stats``"""
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {TABLE_NAME} ("
+        "league TEXT NOT NULL, season TEXT NOT NULL, team TEXT NOT NULL, "
+        f"{HASH_COLUMN} INTEGER NOT NULL, PRIMARY KEY ({', '.join(KEY_COLUMNS)}))"
+    )
+    conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{TABLE_NAME}_team ON {TABLE_NAME} (team)")
+
+    existing = {row[1].lower() for row in conn.execute(f"PRAGMA table_info({TABLE_NAME})")}
+    for col, dtype in stats.dtypes.items():
+        # SQLite compares identifiers case-insensitively
+        if col.lower() not in existing:
+            conn.execute(f"ALTER TABLE {TABLE_NAME} ADD COLUMN {quote(col)} {sql_type(dtype)}")
+
+
+def row_hashes(stats):
+    """64-bit hash of every row, independent of the int/float widths used"""
+    widened = stats.astype({
+        col: "int64" if pd.api.types.is_integer_dtype(dtype) else "float64"
+        for col, dtype in stats.dtypes.items()
+        if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_float_dtype(dtype)
+    })
+    return pd.util.hash_pandas_object(widened, index=False).to_numpy().view(np.int64)
+
+
+def warehouse_rows(league_df, league, season):
+    """Key, hash and stat columns of a league table, ready for the database"""
+    stats = league_df.rename(columns={"Squad": "team"})
+    # Nullable object columns so NaN is stored as NULL and numbers as Python scalars
+    values = stats.astype(object).where(stats.notna(), None)
+    hashes = row_hashes(stats)
+    keys = pd.DataFrame(
+        {"league": league, "season": season, HASH_COLUMN: hashes.astype(object)}, index=stats.index
+    )
+    return pd.concat([keys, values], axis=1)
+
+
+def upsert_league(conn, league_df, league, season=None):
+    """Load one league table into the warehouse
+
+    Rows whose values are unchanged are left alone, changed and new teams
+    are upserted, and teams no longer in the table are deleted. Returns
+    (rows written, rows deleted).
+    """
+    season = season or DEFAULT_SEASON
+    rows = warehouse_rows(league_df, league, season)
+    stat_columns = [col for col in rows.columns if col not in KEY_COLUMNS and col != HASH_COLUMN]
+
+    with conn:
+        ensure_table(conn, league_df.drop(columns="Squad"))
+        columns = ", ".join(quote(col) for col in rows.columns)
+        updates = ", ".join(f"{quote(col)} = excluded.{quote(col)}" for col in [HASH_COLUMN, *stat_columns])
+        before = conn.total_changes
+        conn.executemany(
+            f"INSERT INTO {TABLE_NAME} ({columns}) VALUES ({', '.join('?' * len(rows.columns))}) "
+            f"ON CONFLICT ({', '.join(KEY_COLUMNS)}) DO UPDATE SET {updates} "
+            f"WHERE {TABLE_NAME}.{HASH_COLUMN} IS NOT excluded.{HASH_COLUMN}",
+            rows.itertuples(index=False, name=None),
+        )
+        written = conn.total_changes - before
+
+        stored = {
+            team for (team,) in conn.execute(
+                f"SELECT team FROM {TABLE_NAME} WHERE league = ? AND season = ?", (league, season)
+            )
+        }
+        removed = sorted(stored - set(rows["team"]))
+        conn.executemany(
+            f"DELETE FROM {TABLE_NAME} WHERE league = ? AND season = ? AND team = ?",
+            [(league, season, team) for team in removed],
+        )
+    return written, len(removed)
+
+
+def load_warehouse(league_frames, path):
+    """Upsert {(league, season): DataFrame} into the warehouse at ``path``"""
+    conn = connect(path)
+    try:
+        for (league, season), league_df in league_frames.items():
+            with stage("warehouse_load", league_df, league=league, season=season):
+                written, removed = upsert_league(conn, league_df, league, season)
+            label = f"{league} {season}" if season else league
+            print(f"🏛️ {label}: {written} rows upserted, {removed} removed")
+    finally:
+        conn.close()
+
+
+def query_warehouse(sql, params=(), path=None, data_dir=None):
+    """Run a query against the warehouse and return the result as a DataFrame"""
+    if path is None:
+        path = get_warehouse_path(data_dir or get_data_dir())
+    conn = sqlite3.connect(path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
@@ -1,72 +1,433 @@
 # football_data_warehouse/scripts/pipelines/process_pipelines.py
+import argparse
+import json
 import os
-import importlib.util
 import sys
-from pathlib import Path
+import time
+import traceback
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def run_script(script_name):
-    """Dynamically import and execute a processing script"""
-    # Get the directory of the current script
-    current_dir = Path(__file__).parent.resolve()
-    
-    # Path to the process directory containing the league scripts
-    process_dir = current_dir / "process"
-    script_path = process_dir / script_name
-    
-    if not script_path.exists():
-        print(f"⚠️ Script not found: {script_path}")
-        return
-    
-    # Create a module name from the script path
-    module_name = script_name.replace(".py", "")
-    
+# Only pandas-free modules at import time, so pipeline.py can parse
+# arguments and plan jobs quickly; the engine, warehouse and combine step
+# are imported where they are used.
+from process.formats import OUTPUT_FORMATS
+from process.instrument import Instrumentation, chrome_trace, default_report_path, write_report
+from process.manifest import (
+    fingerprint_file,
+    fingerprint_files,
+    get_manifest_path,
+    load_manifest,
+    manifest_key,
+    save_manifest,
+    stale_reason,
+)
+from process.parse_cache import DEFAULT_CACHE_MB, default_cache_dir, open_cache
+from process.partitions import LAYOUTS
+from process.planner import build_plan, print_plan
+from process.profiling import PROFILE_SORTS, default_profile_dir, profile_call, summarise_profiles
+from process.schema import COLUMN_NAME_STYLES
+from process.specs import (
+    LEAGUES,
+    STAT_CATEGORIES,
+    get_data_dir,
+    job_label,
+    league_input_paths,
+    league_jobs,
+    processed_path_for,
+    transform_spec_hash,
+)
+
+
+def profile_path(profile_dir, league, season=None):
+    """The .pstats file of one (league, season) build"""
+    return os.path.join(profile_dir, f"{league}_{season}.pstats" if season else f"{league}.pstats")
+
+def run_league(league, season=None, keep_frame=False, instrument=False, trace_memory=False,
+               profile_dir=None, **options):
+    """Run the shared processing engine for a single league (season)
+
+    ``options`` are passed through to the engine (e.g. output_format).
+    Returns a result dict with the league and season, success flag, wall
+    time and error message (if any) so callers can summarise the run; with
+    ``keep_frame`` the merged table is included under "frame", and with
+    ``instrument`` the per-stage records under "stages". With
+    ``profile_dir`` the build runs under cProfile and its stats are saved
+    there (see profile_path). With a ``parse_cache`` option its hits and
+    misses for this build are under "parse_cache".
+    """
+    from process.league_engine import run_league as process_league_data
+
+    start = time.perf_counter()
+    frame = None
+    label = job_label(league, season)
+    recorder = Instrumentation(trace_memory) if instrument else None
+    parse_cache = options.get("parse_cache")
+    cache_before = (parse_cache.hits, parse_cache.misses) if parse_cache else None
     try:
-        # Import the module dynamically
-        spec = importlib.util.spec_from_file_location(module_name, script_path)
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[module_name] = module
-        spec.loader.exec_module(module)
-        
-        # Execute the main function if it exists
-        if hasattr(module, 'main'):
-            print(f"🚀 Running {script_name}...")
-            module.main()
-            print(f"✅ Completed {script_name}\n")
-        else:
-            print(f"⚠️ {script_name} has no main() function to execute")
+        print(f"🚀 Running {label}...")
+        with recorder.activate() if recorder else nullcontext():
+            # Recorded here so pool workers can ship their stages back with the result
+            if profile_dir:
+                # cProfile only sees its own thread, so read the raw files in this one
+                merged_df = profile_call(
+                    profile_path(profile_dir, league, season), process_league_data, league,
+                    season=season, read_workers=1, **options
+                )
+            else:
+                merged_df = process_league_data(league, season=season, **options)
+        if keep_frame:
+            frame = merged_df
+        print(f"✅ Completed {label}\n")
+        error = None
     except Exception as e:
-        print(f"❌ Error running {script_name}: {str(e)}\n")
+        print(f"❌ Error running {label}: {str(e)}\n")
         # Print the exception traceback for debugging
-        import traceback
         traceback.print_exc()
+        error = str(e)
 
-def main():
-    """Main function to run all processing pipelines"""
-    # List of script filenames
-    scripts = [
-        "process_brazil_serie_a_data.py",
-        "process_eredivisie_data.py",
-        "process_la_liga_data.py",
-        "process_bundesliga_data.py",
-        "process_championship_data.py",
-        "process_premier_league_data.py",
-        "process_ligue_1_data.py",
-        "process_primeira_liga_data.py",
-        "process_serie_a_data.py",
-        "process_serie_b_data.py"
-    ]
-    
-    print("=" * 60)
-    print("🏁 STARTING DATA PROCESSING PIPELINES")
-    print("=" * 60)
+    return {
+        "league": league,
+        "season": season,
+        "success": error is None,
+        "seconds": time.perf_counter() - start,
+        "error": error,
+        "frame": frame,
+        "stages": recorder.records if recorder else [],
+        "parse_cache": (
+            (parse_cache.hits - cache_before[0], parse_cache.misses - cache_before[1]) if parse_cache else None
+        ),
+    }
+
+def run_leagues(jobs, workers=1, **options):
+    """Run (league, season) jobs sequentially, or across a process pool when workers > 1"""
+    if workers <= 1:
+        return [run_league(league, season, **options) for league, season in jobs]
+
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_league, league, season, **options): (league, season) for league, season in jobs}
+        for future in as_completed(futures):
+            league, season = futures[future]
+            try:
+                results[(league, season)] = future.result()
+            except Exception as e:
+                # The worker process itself died (e.g. killed or unpicklable result)
+                print(f"❌ Worker for {job_label(league, season)} failed: {str(e)}\n")
+                results[(league, season)] = {
+                    "league": league, "season": season, "success": False, "seconds": 0.0,
+                    "error": str(e), "frame": None, "stages": [], "parse_cache": None,
+                }
+
+    # Report in configured league order regardless of completion order
+    return [results[job] for job in jobs]
+
+def plan_incremental(jobs, manifest, data_dir, output_format="csv", layout="flat", **build_options):
+    """Return the (league, season) jobs whose raw inputs or transform spec changed
+
+    ``build_options`` are the engine options that shape the output (they are
+    part of the spec hash). Also returns the new {manifest key: entry}
+    records to store once a rebuilt job succeeds; their "output"
+    fingerprint is added after the build.
+    """
+    spec_hash = transform_spec_hash(output_format=output_format, layout=layout, **build_options)
+    stale, records = [], {}
+    for league, season in jobs:
+        key = manifest_key(league, season)
+        entry = manifest["leagues"].get(key)
+        inputs = fingerprint_files(league_input_paths(league, data_dir, season=season), (entry or {}).get("inputs"))
+        records[key] = {"inputs": inputs, "spec_hash": spec_hash}
+
+        output_path = processed_path_for(league, data_dir, output_format, season, layout)
+        reason = stale_reason(entry, inputs, spec_hash, output_path)
+        if reason:
+            print(f"🔁 {job_label(league, season)}: {reason}")
+            stale.append((league, season))
+        else:
+            print(f"⏭️ {job_label(league, season)}: up to date")
+            # Refresh mtimes so the next run can skip hashing again
+            records[key]["output"] = fingerprint_file(output_path, entry.get("output"))
+            manifest["leagues"][key] = records[key]
+    return stale, records
+
+def print_summary(results):
+    """Print per-league status and timings"""
+    print("-" * 60)
+    for result in results:
+        status = "✅" if result["success"] else "❌"
+        print(f"{status} {job_label(result['league'], result['season']):<20} {result['seconds']:8.2f}s")
+    failed = sum(not result["success"] for result in results)
+    print(f"📊 {len(results) - failed} succeeded, {failed} failed")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the league processing pipelines")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="number of leagues to process in parallel (default: 1, sequential)"
+    )
+    parser.add_argument(
+        "--league", dest="leagues", action="append", choices=list(LEAGUES), metavar="LEAGUE",
+        help="only rebuild this league (repeatable; default: every league in LEAGUES)"
+    )
+    parser.add_argument(
+        "--category", dest="categories", action="append", choices=[c.name for c in STAT_CATEGORIES],
+        metavar="CATEGORY",
+        help="only rebuild this stat category and splice it into each league's existing table "
+             f"(repeatable; one of {', '.join(c.name for c in STAT_CATEGORIES)})"
+    )
+    parser.add_argument(
+        "--format", dest="output_format", choices=sorted(OUTPUT_FORMATS), default="csv",
+        help="file format of the processed league tables (default: csv)"
+    )
+    parser.add_argument(
+        "--float-dtype", choices=["float32", "float64"], default=None,
+        help="stored float type for parquet/feather outputs (default: keep float64)"
+    )
+    parser.add_argument(
+        "--compact", action="store_true",
+        help="store parquet/feather outputs compactly: float32 where every value round-trips "
+             "within tolerance, int32 counts and categorical team/league/season keys"
+    )
+    parser.add_argument(
+        "--combine", action="store_true",
+        help="combine the league tables in memory into Final_data after processing"
+    )
+    parser.add_argument(
+        "--no-persist", dest="persist", action="store_false",
+        help="with --combine, skip writing the per-league Processed_data files"
+    )
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="only rebuild leagues whose raw files or transform spec changed"
+    )
+    parser.add_argument(
+        "--column-names", choices=COLUMN_NAME_STYLES, default="legacy",
+        help="raw column naming: legacy pandas names (Gls.1) or group-qualified "
+             "names (Gls (Per 90 Minutes)) (default: legacy)"
+    )
+    parser.add_argument(
+        "--strict-schema", action="store_true",
+        help="fail a league when a raw file's columns or types drift from its category spec"
+    )
+    parser.add_argument(
+        "--layout", choices=LAYOUTS, default="flat",
+        help="processed storage: one file per league (flat) or league=/season= "
+             "partitions covering every raw season (default: flat)"
+    )
+    parser.add_argument(
+        "--warehouse", action="store_true",
+        help="upsert each rebuilt league table into the SQLite warehouse in data/"
+    )
+    parser.add_argument(
+        "--run-report", nargs="?", const="", default=None, metavar="PATH",
+        help="write a JSON report of per-stage wall/CPU time and frame shapes "
+             "(default path: data/run_reports/process_pipelines_<time>.json)"
+    )
+    parser.add_argument(
+        "--trace", default=None, metavar="PATH",
+        help="write a Chrome trace-event JSON timeline of the run (open in chrome://tracing or Perfetto)"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true",
+        help="with --run-report, also record each stage's peak memory (tracemalloc, slower)"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const="", default=None, metavar="DIR",
+        help="run each league under cProfile (reading its raw files on one thread), save a .pstats "
+             "file per league and print the hottest functions across all leagues "
+             "(default DIR: data/profiles/<time>/)"
+    )
+    parser.add_argument(
+        "--profile-top", type=int, default=25, metavar="N",
+        help="functions listed in the --profile summary (default: 25)"
+    )
+    parser.add_argument(
+        "--profile-sort", choices=PROFILE_SORTS, default="tottime",
+        help="ordering of the --profile summary (default: tottime)"
+    )
+    parser.add_argument(
+        "--parse-cache", nargs="?", type=float, const=DEFAULT_CACHE_MB, default=None, metavar="MB",
+        help="keep parsed raw files as Feather sidecars in data/parse_cache/ and load unchanged files "
+             f"from them on later runs, evicting least recently used sidecars beyond MB (default: {DEFAULT_CACHE_MB})"
+    )
+    parser.add_argument(
+        "--plan", action="store_true",
+        help="dry run: list the raw files each league would read (and which are missing or stale), "
+             "the leagues that would be rebuilt and their output columns, without loading any data"
+    )
+    parser.add_argument("--json", action="store_true", help="with --plan, print the plan as JSON")
+    parser.add_argument(
+        "--verbose", action="store_true",
+        help="with --plan, list every output column instead of counts per stat category"
+    )
+    args = parser.parse_args(argv)
+    if (args.json or args.verbose) and not args.plan:
+        parser.error("--json and --verbose require --plan")
+    if args.compact and args.output_format == "csv":
+        parser.error("--compact applies to the parquet/feather formats")
+    if args.compact and args.float_dtype:
+        parser.error("--compact already picks the float types, drop --float-dtype")
+    if args.trace_memory and args.run_report is None and args.trace is None:
+        parser.error("--trace-memory requires --run-report or --trace")
+    if not args.persist and not args.combine:
+        parser.error("--no-persist requires --combine")
+    if args.categories and args.incremental:
+        parser.error("--incremental rebuilds whole leagues, it cannot be used with --category")
+    if args.incremental and not args.persist:
+        parser.error("--incremental needs the per-league files, it cannot be used with --no-persist")
+    return args
+
+def main(argv=None):
+    """Main function to run all processing pipelines
+
+    Returns True when every build, and the combine step if requested,
+    succeeded (always for --plan).
+    """
+    args = parse_args(argv)
+    started = time.time()
+    recorder = Instrumentation(args.trace_memory)
+    instrument = args.run_report is not None or args.trace is not None
+
+    if not args.plan:
+        print("=" * 60)
+        print("🏁 STARTING DATA PROCESSING PIPELINES")
+        print("=" * 60)
     
-    # Execute each script in sequence
-    for script in scripts:
-        run_script(script)
+    build_options = {
+        "output_format": args.output_format,
+        "float_dtype": args.float_dtype,
+        "column_names": args.column_names,
+        "layout": args.layout,
+        "compact": args.compact,
+    }
+
+    data_dir = get_data_dir()
+    profile_dir = None
+    if args.profile is not None:
+        profile_dir = args.profile or default_profile_dir(data_dir)
+    leagues = [league for league in LEAGUES if not args.leagues or league in args.leagues]
+    categories = tuple(c for c in STAT_CATEGORIES if not args.categories or c.name in args.categories)
+    jobs = league_jobs(leagues, args.layout, data_dir)
+    if args.plan:
+        plan = build_plan(
+            jobs, data_dir, load_manifest(get_manifest_path(data_dir)), transform_spec_hash(**build_options),
+            args.output_format, args.layout, args.column_names, args.incremental, categories,
+        )
+        if args.json:
+            print(json.dumps(plan, indent=2))
+        else:
+            print_plan(plan, args.verbose)
+        return True
+    if args.incremental:
+        manifest_path = get_manifest_path(data_dir)
+        manifest = load_manifest(manifest_path)
+        jobs, records = plan_incremental(jobs, manifest, data_dir, **build_options)
+
+    # Every league goes through the same engine and category specs
+    parse_cache = None
+    if args.parse_cache is not None:
+        parse_cache = open_cache(default_cache_dir(data_dir), args.parse_cache)
+
+    results = run_leagues(
+        jobs,
+        workers=args.workers,
+        **build_options,
+        categories=categories,
+        parse_cache=parse_cache,
+        persist=args.persist,
+        strict_schema=args.strict_schema,
+        keep_frame=args.combine or args.warehouse,
+        instrument=instrument,
+        trace_memory=args.trace_memory,
+        profile_dir=profile_dir,
+    )
+    for result in results:
+        recorder.extend(result["stages"])
+    print_summary(results)
+    if parse_cache:
+        # Pool workers count on their own copies, so total the per-build counts
+        parse_cache.hits = sum(r["parse_cache"][0] for r in results if r["parse_cache"])
+        parse_cache.misses = sum(r["parse_cache"][1] for r in results if r["parse_cache"])
+        print(parse_cache.summary())
+
+    if args.incremental:
+        for result in results:
+            if result["success"]:
+                key = manifest_key(result["league"], result["season"])
+                output_path = processed_path_for(
+                    result["league"], data_dir, args.output_format, result["season"], args.layout
+                )
+                manifest["leagues"][key] = {**records[key], "output": fingerprint_file(output_path)}
+        save_manifest(manifest, manifest_path)
+
+    combined = True
+    with recorder.activate() if instrument else nullcontext():
+        if args.warehouse:
+            print("=" * 60)
+            print("🏁 LOADING THE WAREHOUSE")
+            print("=" * 60)
+            from process.warehouse import get_warehouse_path, load_warehouse
+
+            warehouse_path = get_warehouse_path(data_dir)
+            load_warehouse({(r["league"], r["season"]): r["frame"] for r in results if r["success"]}, warehouse_path)
+            print(f"💾 Warehouse: {warehouse_path}")
+
+        if args.combine:
+            # Hand the merged tables straight to the combine step (no re-read)
+            print("=" * 60)
+            print("🏁 COMBINING LEAGUES IN MEMORY")
+            print("=" * 60)
+            import combined_leagues
+
+            if args.layout == "partitioned":
+                league_frames = {(r["league"], r["season"]): r["frame"] for r in results if r["success"]}
+            else:
+                league_frames = {r["league"]: r["frame"] for r in results if r["success"]}
+            if args.leagues and args.persist:
+                # The selected leagues are stored now, so combine every stored table in the usual order
+                league_frames = None
+            failed = [job_label(r["league"], r["season"]) for r in results if not r["success"]]
+            if failed:
+                print(f"⚠️ Combining the stored tables of the failed builds: {', '.join(failed)}")
+            combined = combined_leagues.main(
+                input_format=args.output_format,
+                output_format=args.output_format,
+                float_dtype=args.float_dtype,
+                compact=args.compact,
+                league_frames=league_frames,
+                incremental=args.incremental,
+                # Leagues not rebuilt (or whose build failed) are read back from Processed_data
+                partial=args.leagues is not None or bool(failed),
+                layout=args.layout,
+            )
+
+    if profile_dir:
+        summary = summarise_profiles(
+            [profile_path(profile_dir, r["league"], r["season"]) for r in results],
+            args.profile_top, args.profile_sort,
+        )
+        if summary:
+            summary_path = os.path.join(profile_dir, "summary.txt")
+            with open(summary_path, "w", encoding="utf-8") as f:
+                f.write(summary)
+            print("=" * 60)
+            print(f"🔥 TOP {args.profile_top} FUNCTIONS BY {args.profile_sort.upper()} ACROSS ALL LEAGUES")
+            print("=" * 60)
+            print(summary)
+            print(f"💾 Profiles saved to {profile_dir}")
+
+    if args.run_report is not None:
+        report_path = args.run_report or default_report_path(data_dir, "process_pipelines")
+        write_report(recorder.report("process_pipelines", started, argv), report_path)
+        print(f"📈 Run report saved to {report_path}")
+    if args.trace:
+        write_report(chrome_trace(recorder.records, started), args.trace)
+        print(f"🧵 Trace saved to {args.trace}")
     
     print("=" * 60)
     print("🏁 ALL PROCESSING PIPELINES COMPLETED")
     print("=" * 60)
+    return combined and all(result["success"] for result in results)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(0 if main() else 1)